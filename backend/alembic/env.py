@@ -14,6 +14,11 @@ from app.db.database import Base, _to_async_db_url
 # Import models for autogenerate
 from app.models.user import User  # noqa
 from app.models.student import Student  # noqa
+from app.models.student_status_count import StudentStatusCount  # noqa
+from app.models.table_version import TableVersion  # noqa
+from app.models.rate_limit import RateLimitCounter  # noqa
+from app.models.drive_session import DriveSession  # noqa
+from app.models.audit_log import AuditEntry  # noqa
 from app.models.enums import Role, StudentStatus  # noqa
 
 config = context.config
@@ -0,0 +1,84 @@
+"""student status counts summary table
+
+Revision ID: 0002_student_status_counts
+Revises: 0001_init
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002_student_status_counts"
+down_revision = "0001_init"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE student_status_counts (
+            status student_status_enum PRIMARY KEY,
+            count bigint NOT NULL DEFAULT 0
+        )
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO student_status_counts (status, count)
+        SELECT s, (SELECT count(*) FROM students WHERE status = s)
+        FROM unnest(enum_range(NULL::student_status_enum)) AS s
+        """
+    )
+    # Statement-level triggers with transition tables: a bulk import or batch
+    # update touches each summary row once per statement, not once per student.
+    # Installed whatever DASHBOARD_STATS_SOURCE is: the table stays exact, so
+    # the setting can be switched to "summary" at any time without a backfill.
+    op.execute(
+        """
+        CREATE FUNCTION student_status_counts_apply() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                UPDATE student_status_counts c SET count = c.count + d.n
+                FROM (SELECT status, count(*) AS n FROM new_rows GROUP BY status) d
+                WHERE c.status = d.status;
+            ELSIF TG_OP = 'DELETE' THEN
+                UPDATE student_status_counts c SET count = c.count - d.n
+                FROM (SELECT status, count(*) AS n FROM old_rows GROUP BY status) d
+                WHERE c.status = d.status;
+            ELSE
+                UPDATE student_status_counts c SET count = c.count + d.n
+                FROM (
+                    SELECT status, sum(delta) AS n FROM (
+                        SELECT status, 1 AS delta FROM new_rows
+                        UNION ALL
+                        SELECT status, -1 AS delta FROM old_rows
+                    ) x GROUP BY status HAVING sum(delta) <> 0
+                ) d
+                WHERE c.status = d.status;
+            END IF;
+            RETURN NULL;
+        END $$
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER students_status_counts_ins AFTER INSERT ON students "
+        "REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION student_status_counts_apply()"
+    )
+    op.execute(
+        "CREATE TRIGGER students_status_counts_upd AFTER UPDATE ON students "
+        "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION student_status_counts_apply()"
+    )
+    op.execute(
+        "CREATE TRIGGER students_status_counts_del AFTER DELETE ON students "
+        "REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION student_status_counts_apply()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER students_status_counts_del ON students")
+    op.execute("DROP TRIGGER students_status_counts_upd ON students")
+    op.execute("DROP TRIGGER students_status_counts_ins ON students")
+    op.execute("DROP FUNCTION student_status_counts_apply()")
+    op.drop_table("student_status_counts")
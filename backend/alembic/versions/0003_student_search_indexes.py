@@ -0,0 +1,34 @@
+"""student search and filter indexes
+
+Revision ID: 0003_student_search_indexes
+Revises: 0002_student_status_counts
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003_student_search_indexes"
+down_revision = "0002_student_status_counts"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # CONCURRENTLY keeps students writable while the indexes build.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_students_name_trgm "
+            "ON students USING gin (name gin_trgm_ops)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_students_status_id "
+            "ON students (status, id)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_students_status_id")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_students_name_trgm")
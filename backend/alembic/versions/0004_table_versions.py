@@ -0,0 +1,27 @@
+"""table change counters for conditional GETs
+
+Revision ID: 0004_table_versions
+Revises: 0003_student_search_indexes
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004_table_versions"
+down_revision = "0003_student_search_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "table_versions",
+        sa.Column("name", sa.String(length=64), primary_key=True),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.execute("INSERT INTO table_versions (name, version) VALUES ('students', 1)")
+
+
+def downgrade() -> None:
+    op.drop_table("table_versions")
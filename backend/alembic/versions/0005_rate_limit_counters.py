@@ -0,0 +1,35 @@
+"""shared rate limit counters
+
+Revision ID: 0005_rate_limit_counters
+Revises: 0004_table_versions
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005_rate_limit_counters"
+down_revision = "0004_table_versions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # UNLOGGED: counters are disposable, skip WAL for the hot upsert.
+    op.execute(
+        """
+        CREATE UNLOGGED TABLE rate_limit_counters (
+            key varchar(255) NOT NULL,
+            window_start bigint NOT NULL,
+            hits integer NOT NULL DEFAULT 0,
+            expires_at timestamptz NOT NULL,
+            PRIMARY KEY (key, window_start)
+        )
+        """
+    )
+    op.create_index("ix_rate_limit_counters_expires_at", "rate_limit_counters", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_rate_limit_counters_expires_at", table_name="rate_limit_counters")
+    op.drop_table("rate_limit_counters")
@@ -0,0 +1,60 @@
+"""drive session log, range-partitioned by month
+
+Revision ID: 0006_drive_sessions
+Revises: 0005_rate_limit_counters
+Create Date: 2026-10-18
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006_drive_sessions"
+down_revision = "0005_rate_limit_counters"
+branch_labels = None
+depends_on = None
+
+# Months created up front; scripts/manage_partitions.py keeps adding ahead.
+# Ingest accepts backdated sessions, so the past year (the history window)
+# gets partitions too; anything older lands in the default partition and is
+# split out by manage_partitions.py.
+MONTHS_BACK = 12
+MONTHS_AHEAD = 3
+
+
+def _month(start: date, offset: int) -> date:
+    n = start.year * 12 + start.month - 1 + offset
+    return date(n // 12, n % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    # Append-only. The primary key must include the partition key. Rows
+    # outside every monthly range land in the default partition, which should
+    # stay empty (manage_partitions.py warns if it does not).
+    op.execute(
+        """
+        CREATE TABLE drive_sessions (
+            id bigserial NOT NULL,
+            student_id integer NOT NULL REFERENCES students (id) ON DELETE CASCADE,
+            instructor_id integer REFERENCES users (id) ON DELETE SET NULL,
+            started_at timestamptz NOT NULL,
+            duration_minutes integer NOT NULL CHECK (duration_minutes > 0 AND duration_minutes <= 720),
+            created_at timestamptz NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, started_at)
+        ) PARTITION BY RANGE (started_at)
+        """
+    )
+    op.create_index("ix_drive_sessions_student_started", "drive_sessions", ["student_id", "started_at"])
+    op.execute("CREATE TABLE drive_sessions_default PARTITION OF drive_sessions DEFAULT")
+    first = date.today().replace(day=1)
+    for i in range(-MONTHS_BACK, MONTHS_AHEAD + 1):
+        lo, hi = _month(first, i), _month(first, i + 1)
+        op.execute(
+            f"CREATE TABLE drive_sessions_y{lo:%Y}m{lo:%m} PARTITION OF drive_sessions "
+            f"FOR VALUES FROM ('{lo.isoformat()}') TO ('{hi.isoformat()}')"
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("drive_sessions")  # drops every partition with it
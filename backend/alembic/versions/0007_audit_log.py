@@ -0,0 +1,38 @@
+"""write-behind audit log
+
+Revision ID: 0007_audit_log
+Revises: 0006_drive_sessions
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0007_audit_log"
+down_revision = "0006_drive_sessions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "audit_log",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("occurred_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("actor_id", sa.Integer(), nullable=True),
+        sa.Column("actor", sa.String(length=50), nullable=True),
+        sa.Column("action", sa.String(length=32), nullable=False),
+        sa.Column("entity", sa.String(length=32), nullable=False),
+        sa.Column("entity_id", sa.BigInteger(), nullable=True),
+        sa.Column("detail", postgresql.JSONB(), nullable=True),
+    )
+    op.create_index("ix_audit_log_entity", "audit_log", ["entity", "entity_id"])
+    # Append-only and time-ordered: a BRIN index is tiny and nearly free to maintain.
+    op.create_index("ix_audit_log_occurred_at", "audit_log", ["occurred_at"], postgresql_using="brin")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_log_occurred_at", table_name="audit_log")
+    op.drop_index("ix_audit_log_entity", table_name="audit_log")
+    op.drop_table("audit_log")
@@ -0,0 +1,28 @@
+"""student progress_hours sort index
+
+Revision ID: 0008_student_progress_index
+Revises: 0007_audit_log
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008_student_progress_index"
+down_revision = "0007_audit_log"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Serves sort=progress_hours pages, ordered and seeked by (progress_hours, id).
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_students_progress_hours_id "
+            "ON students (progress_hours, id)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_students_progress_hours_id")
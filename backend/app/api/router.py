@@ -1,10 +1,18 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from app.api.routers import health, auth, students, dashboard, users
+from app.api.routers import health, auth, students, dashboard, users, metrics, drive_sessions
+from app.core.config import settings
+from app.core.limiter import default_limit
+
+# Per-client default limit on everything but health probes.
+limited = [Depends(default_limit)]
 
 api_router = APIRouter()
 api_router.include_router(health.router, tags=["health"])
-api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
-api_router.include_router(students.router, prefix="/students", tags=["students"])
-api_router.include_router(dashboard.router, tags=["dashboard"])
-api_router.include_router(users.router, prefix="/users", tags=["users"])
+api_router.include_router(auth.router, prefix="/auth", tags=["auth"], dependencies=limited)
+api_router.include_router(students.router, prefix="/students", tags=["students"], dependencies=limited)
+api_router.include_router(drive_sessions.router, prefix="/drive-sessions", tags=["drive-sessions"], dependencies=limited)
+api_router.include_router(dashboard.router, tags=["dashboard"], dependencies=limited)
+api_router.include_router(users.router, prefix="/users", tags=["users"], dependencies=limited)
+if settings.metrics_enabled:
+    api_router.include_router(metrics.router, tags=["metrics"])
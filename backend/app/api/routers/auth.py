@@ -1,28 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import verify_password, create_access_token
-from app.db.database import get_db
+from app.core.security import PasswordHashBusy, verify_password_async, create_access_token
+from app.dependencies.db import get_primary_read_db
 from app.crud.user import get_by_username
 from app.schemas.token import Token
 from app.schemas.user import UserPublic
 from app.dependencies.auth import get_current_user
+from app.core.config import settings
 from app.core.limiter import limiter
 
 router = APIRouter()
 
-@router.post("/login", response_model=Token)
-@limiter.limit("10/minute")
+login_limit = limiter.limit(settings.rate_limit_login, scope="login")
+
+@router.post("/login", response_model=Token, dependencies=[Depends(login_limit)])
 async def login(
-    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_primary_read_db),
 ):
     user = await get_by_username(db, form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    try:
+        valid = bool(user) and await verify_password_async(form_data.password, user.hashed_password)
+    except PasswordHashBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent logins, retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    if not valid:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid username or password")
-    token = create_access_token(subject=user.username, role=user.role.value)
+    token = create_access_token(subject=user.username, role=user.role.value, user_id=user.id)
     return Token(access_token=token, token_type="bearer")
 
 
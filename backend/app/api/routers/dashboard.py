@@ -1,20 +1,27 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
+from app.core.etag import cache_headers, etag_matches, make_etag, not_modified
+from app.core.responses import json_response
+from app.dependencies.db import get_read_db
 from app.dependencies.auth import require_role
 from app.models.enums import Role
 from app.schemas.dashboard import DashboardStats
-from app.crud.student import dashboard_stats
+from app.crud.student import dashboard_stats, students_version
 
 router = APIRouter()
 
 @router.get("/dashboard-stats", response_model=DashboardStats)
 async def get_dashboard_stats(
-    db: AsyncSession = Depends(get_db),
-    _user = Depends(require_role(Role.admin, Role.instructor)),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    _user = Depends(require_role(Role.admin, Role.instructor, from_claims=True)),
 ):
-    data = await dashboard_stats(db)
-    return DashboardStats(**data)
+    version = await students_version(db)
+    etag = make_etag(version, request.url.path) if version is not None else None
+    if etag and etag_matches(request, etag):
+        return not_modified(etag)
+    data = await dashboard_stats(db, version=version)
+    return json_response(DashboardStats(**data).model_dump(), headers=cache_headers(etag))
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from pydantic import AwareDatetime
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.audit import audit_log
+from app.core.config import settings
+from app.core.responses import rows_response
+from app.crud import drive_session as crud
+from app.db.database import get_db
+from app.dependencies.auth import Principal, require_role
+from app.dependencies.db import get_read_db
+from app.models.enums import Role
+from app.schemas.drive_session import DriveSessionCreate, DriveSessionIngestResult, DriveSessionOut
+
+router = APIRouter()
+
+
+# drive_sessions is partitioned on Postgres and its composite key does not
+# autoincrement elsewhere.
+def _require_postgres() -> None:
+    if make_url(settings.database_url).get_backend_name() not in ("postgres", "postgresql"):
+        raise HTTPException(status_code=503, detail="Drive sessions require PostgreSQL")
+
+
+# Bulk ingest from instructor devices: all rows or none, and each student's
+# progress_hours grows by the logged time in the same transaction.
+@router.post("/", response_model=DriveSessionIngestResult, dependencies=[Depends(_require_postgres)])
+async def ingest_drive_sessions(
+    items: list[DriveSessionCreate] = Body(..., min_length=1),
+    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(require_role(Role.admin, Role.instructor)),
+):
+    if len(items) > settings.drive_sessions_ingest_max_rows:
+        raise HTTPException(
+            status_code=413, detail=f"At most {settings.drive_sessions_ingest_max_rows} sessions per request",
+        )
+    rows = [
+        {
+            "student_id": it.student_id,
+            "instructor_id": it.instructor_id or user.id,
+            "started_at": it.started_at,
+            "duration_minutes": it.duration_minutes,
+        }
+        for it in items
+    ]
+    try:
+        student_ids = await crud.ingest_sessions(db, rows)
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=422, detail="Unknown student_id or instructor_id")
+    audit_log.record(user, "ingest", "drive_session", detail={"count": len(rows), "student_ids": student_ids})
+    return DriveSessionIngestResult(inserted=len(rows), student_ids=student_ids)
+
+
+# One student's sessions in [start, end), newest first. Defaults to the last
+# 90 days; the range is capped so a query only touches a bounded number of
+# monthly partitions.
+@router.get("/", response_model=list[DriveSessionOut], dependencies=[Depends(_require_postgres)])
+async def list_drive_sessions(
+    student_id: int = Query(..., ge=1),
+    start: AwareDatetime | None = None,
+    end: AwareDatetime | None = None,
+    limit: int = Query(500, ge=1, le=5000),
+    db: AsyncSession = Depends(get_read_db),
+    _user = Depends(require_role(Role.admin, Role.instructor, from_claims=True)),
+):
+    end = end or datetime.now(timezone.utc)
+    start = start or end - timedelta(days=90)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    if end - start > timedelta(days=settings.drive_sessions_history_max_days):
+        raise HTTPException(
+            status_code=400, detail=f"Range is limited to {settings.drive_sessions_history_max_days} days",
+        )
+    rows = await crud.list_student_sessions(db, student_id, start=start, end=end, limit=limit)
+    return rows_response(rows)
@@ -1,7 +1,51 @@
-from fastapi import APIRouter
+import time
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import text
+
+from app.core.audit import audit_log
+from app.core.security import token_cache_stats
+from app.db.database import engine, pool_status, read_engine
+from app.dependencies.auth import principal_cache, require_monitoring
 
 router = APIRouter()
 
 @router.get("/health")
 async def health():
     return {"status": "ok"}
+
+
+# Only /health is public; the detail endpoints need MONITORING_TOKEN or an
+# admin token.
+
+# Readiness: round-trips the database and reports this worker's pool.
+@router.get("/health/db")
+async def health_db(_auth = Depends(require_monitoring)):
+    start = time.perf_counter()
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except Exception as exc:
+        return ORJSONResponse(
+            status_code=503,
+            content={"status": "unavailable", "error": type(exc).__name__, "pool": pool_status(engine)},
+        )
+    data = {
+        "status": "ok",
+        "latency_ms": round((time.perf_counter() - start) * 1000, 3),
+        "pool": pool_status(engine),
+    }
+    if read_engine is not engine:
+        data["read_pool"] = pool_status(read_engine)
+    return data
+
+
+@router.get("/health/cache")
+async def health_cache(_auth = Depends(require_monitoring)):
+    return {"principal": principal_cache.stats(), "token": token_cache_stats()}
+
+
+@router.get("/health/audit")
+async def health_audit(_auth = Depends(require_monitoring)):
+    return audit_log.stats()
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Depends, Response
+
+from app.core.metrics import render_latest
+from app.dependencies.auth import require_monitoring
+
+router = APIRouter()
+
+# Prometheus text format. Sync so the multiprocess file scan runs off the
+# event loop. Needs MONITORING_TOKEN or an admin token.
+@router.get("/metrics", include_in_schema=False)
+def metrics(_auth = Depends(require_monitoring)):
+    body, content_type = render_latest()
+    return Response(body, media_type=content_type)
@@ -1,49 +1,338 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+import csv
+import io
+from typing import Any, Literal
 
+import orjson
+from fastapi import APIRouter, Body, Depends, File, HTTPException, Query, Request, UploadFile, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.audit import audit_log
+from app.core.config import settings
+from app.core.events import SubscriberLimit, student_changes
+from app.core.etag import cache_headers, etag_matches, make_etag, not_modified
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.responses import json_response, row_dict, rows_response
 from app.db.database import get_db
-from app.dependencies.auth import require_role
-from app.models.enums import Role
-from app.schemas.student import StudentCreate, StudentOut, StudentUpdate
+from app.dependencies.auth import Principal, require_role
+from app.dependencies.db import get_read_db, get_read_sessionmaker
+from app.models.enums import Role, StudentStatus
+from app.schemas.student import (
+    StudentBatchDeleteResult,
+    StudentBatchIds,
+    StudentBatchProgress,
+    StudentBatchStatus,
+    StudentCreate,
+    StudentFilters,
+    StudentImportResult,
+    StudentImportRowError,
+    StudentOut,
+    StudentPage,
+    StudentUpdate,
+)
 from app.crud import student as crud
 
 router = APIRouter()
 
+MAX_PAGE_SIZE = settings.students_max_page_size
+
+SortField = Literal["id", "name", "status", "progress_hours"]
+SortOrder = Literal["asc", "desc"]
+
+
+def student_filters(
+    status: StudentStatus | None = None,
+    min_hours: float | None = Query(None, ge=0),
+    max_hours: float | None = Query(None, ge=0),
+    q: str | None = Query(None, min_length=1, max_length=120, description="Case-insensitive name substring"),
+) -> StudentFilters:
+    return StudentFilters(status=status, min_hours=min_hours, max_hours=max_hours, q=q)
+
+
+# Conditional GET: the students change counter plus the request's path and
+# query identify the body, so a matching If-None-Match is answered with 304
+# before any rows are read.
+async def _students_etag(db: AsyncSession, request: Request) -> str | None:
+    version = await crud.students_version(db)
+    if version is None:
+        return None
+    return make_etag(version, request.url.path, request.url.query)
+
+
 # Backwards compatible: GET/POST /api/students
 @router.get("/", response_model=list[StudentOut])
 async def list_students(
-    db: AsyncSession = Depends(get_db),
-    _user = Depends(require_role(Role.admin, Role.instructor)),
-    limit: int = 200,
-    offset: int = 0,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    _user = Depends(require_role(Role.admin, Role.instructor, from_claims=True)),
+    filters: StudentFilters = Depends(student_filters),
+    limit: int = Query(200, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    after_id: int | None = Query(None, ge=1),
+    sort: SortField = "id",
+    order: SortOrder = "desc",
+):
+    if after_id is not None and sort != "id":
+        raise HTTPException(status_code=400, detail="after_id requires sort=id; use /students/page for other sorts")
+    etag = await _students_etag(db, request)
+    if etag and etag_matches(request, etag):
+        return not_modified(etag)
+    rows = await crud.list_student_rows(
+        db,
+        limit=limit,
+        offset=offset,
+        filters=filters,
+        sort=sort,
+        descending=order == "desc",
+        after=(after_id, after_id) if after_id is not None else None,
+    )
+    return rows_response(rows, headers=cache_headers(etag))
+
+
+# A tampered cursor key must be a 400, not a failed bind at query time.
+_CURSOR_KEY_TYPES = {"id": int, "name": str, "status": StudentStatus, "progress_hours": float}
+
+
+def _cursor_key(sort: str, value: Any) -> Any:
+    if isinstance(value, (dict, list, bool)) or value is None:
+        raise TypeError("bad cursor key")
+    return _CURSOR_KEY_TYPES[sort](value)
+
+
+# Cursor pagination: pass next_cursor back as `cursor` (with the same sort,
+# order and filters) until it is null.
+@router.get("/page", response_model=StudentPage)
+async def list_students_page(
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    _user = Depends(require_role(Role.admin, Role.instructor, from_claims=True)),
+    filters: StudentFilters = Depends(student_filters),
+    limit: int = Query(200, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    sort: SortField = "id",
+    order: SortOrder = "desc",
 ):
-    items = await crud.list_students(db, limit=limit, offset=offset)
-    return [StudentOut(**s.__dict__) for s in items]
+    after = None
+    if cursor:
+        try:
+            data = decode_cursor(cursor)
+            if data.get("s", "id") != sort or data.get("o", "desc") != order:
+                raise ValueError("cursor does not match sort")
+            after = (_cursor_key(sort, data["k"]), int(data["id"]))
+        except (ValueError, KeyError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    etag = await _students_etag(db, request)
+    if etag and etag_matches(request, etag):
+        return not_modified(etag)
+    rows = await crud.list_student_rows(
+        db, limit=limit + 1, filters=filters, sort=sort, descending=order == "desc", after=after,
+    )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor({"s": sort, "o": order, "k": last._mapping[sort], "id": last.id})
+    return json_response(
+        {"items": [row_dict(r) for r in rows], "next_cursor": next_cursor},
+        headers=cache_headers(etag),
+    )
+
+
+async def _export_ndjson(sessionmaker: async_sessionmaker, filters: StudentFilters):
+    keys = crud.EXPORT_COLUMNS
+    async with sessionmaker() as db:
+        async for rows in crud.stream_students(db, filters=filters):
+            yield b"".join(orjson.dumps(dict(zip(keys, row))) + b"\n" for row in rows)
+
+
+async def _export_csv(sessionmaker: async_sessionmaker, filters: StudentFilters):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(crud.EXPORT_COLUMNS)
+    async with sessionmaker() as db:
+        async for rows in crud.stream_students(db, filters=filters):
+            writer.writerows((r.id, r.name, r.status.value, r.progress_hours, r.notes or "") for r in rows)
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+
+
+# Full roster dump for reporting. The generators open their own session:
+# request-scoped dependencies are closed before a streamed body is sent, so
+# they get a sessionmaker routed like get_read_db (primary after a write).
+@router.get("/export", response_class=StreamingResponse)
+async def export_students(
+    sessionmaker: async_sessionmaker = Depends(get_read_sessionmaker),
+    _user = Depends(require_role(Role.admin, Role.instructor, from_claims=True)),
+    filters: StudentFilters = Depends(student_filters),
+    format: Literal["ndjson", "csv"] = "ndjson",
+):
+    if format == "csv":
+        return StreamingResponse(
+            _export_csv(sessionmaker, filters),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="students.csv"'},
+        )
+    return StreamingResponse(_export_ndjson(sessionmaker, filters), media_type="application/x-ndjson")
+
+
+async def _event_stream(request: Request):
+    try:
+        async with student_changes.subscribe() as queue:
+            yield b"retry: 3000\n\n"
+            while True:
+                try:
+                    payload = await asyncio.wait_for(queue.get(), timeout=settings.events_heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield b": keepalive\n\n"
+                    continue
+                if payload is None:
+                    # Fell behind or lost the LISTEN connection: refetch, reconnect.
+                    yield b"event: resync\ndata: {}\n\n"
+                    return
+                yield b"event: change\ndata: " + payload.encode() + b"\n\n"
+    except SubscriberLimit:
+        yield b"event: resync\ndata: {}\n\n"
+
+
+# Live change feed (Postgres LISTEN/NOTIFY). Events are
+# {"op": "create"|"update"|"delete", "ids": [...] | null}; on `resync`
+# clients should refetch and reconnect. Replaces polling the list/stats.
+@router.get("/events", response_class=StreamingResponse)
+async def student_events(
+    request: Request,
+    _user = Depends(require_role(Role.admin, Role.instructor, from_claims=True)),
+):
+    if make_url(settings.database_url).get_backend_name() not in ("postgres", "postgresql"):
+        raise HTTPException(status_code=503, detail="Change feed requires PostgreSQL")
+    if student_changes.subscriber_count >= settings.events_max_subscribers:
+        raise HTTPException(status_code=503, detail="Too many event subscribers", headers={"Retry-After": "5"})
+    return StreamingResponse(
+        _event_stream(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.post("/", response_model=StudentOut, status_code=status.HTTP_201_CREATED)
 async def create_student(
     payload: StudentCreate,
     db: AsyncSession = Depends(get_db),
-    _user = Depends(require_role(Role.admin, Role.instructor)),
+    user: Principal = Depends(require_role(Role.admin, Role.instructor)),
 ):
-    st = await crud.create_student(db, payload)
-    return StudentOut(**st.__dict__)
+    row = await crud.create_student(db, payload)
+    audit_log.record(user, "create", "student", row.id)
+    return json_response(row_dict(row), status_code=status.HTTP_201_CREATED)
+
+
+async def _import_rows(db: AsyncSession, user: Principal, items: list[Any]) -> StudentImportResult:
+    if len(items) > settings.students_import_max_rows:
+        raise HTTPException(status_code=413, detail=f"At most {settings.students_import_max_rows} rows per import")
+    valid: list[dict] = []
+    errors: list[StudentImportRowError] = []
+    for idx, item in enumerate(items):
+        try:
+            valid.append(StudentCreate.model_validate(item).model_dump())
+        except ValidationError as exc:
+            errors.append(StudentImportRowError(
+                row=idx,
+                errors=[f"{'.'.join(str(p) for p in e['loc']) or 'row'}: {e['msg']}" for e in exc.errors()],
+            ))
+    ids = await crud.bulk_create_students(db, valid) if valid else []
+    if ids:
+        audit_log.record(user, "import", "student", detail={"ids": ids})
+    return StudentImportResult(inserted=len(ids), ids=ids, errors=errors)
+
+
+# Bulk onboarding. Invalid rows are reported by index and skipped; valid rows
+# are inserted together in a single transaction.
+@router.post("/import", response_model=StudentImportResult)
+async def import_students(
+    items: list[Any] = Body(...),
+    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(require_role(Role.admin, Role.instructor)),
+):
+    return await _import_rows(db, user, items)
+
+
+# CSV with a header row: name,status,progress_hours,notes (blank = default).
+@router.post("/import/csv", response_model=StudentImportResult)
+async def import_students_csv(
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(require_role(Role.admin, Role.instructor)),
+):
+    try:
+        text = (await file.read()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="CSV must be UTF-8 encoded")
+    items = [
+        {k.strip(): v for k, v in row.items() if k and v not in (None, "")}
+        for row in csv.DictReader(io.StringIO(text))
+    ]
+    return await _import_rows(db, user, items)
+
+
+# Batch mutations: one UPDATE/DELETE ... RETURNING per call, in one
+# transaction. Unknown ids are ignored; the response lists what changed.
+@router.post("/batch/status", response_model=list[StudentOut])
+async def batch_update_status(
+    payload: StudentBatchStatus,
+    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(require_role(Role.admin, Role.instructor)),
+):
+    rows = await crud.batch_update_status(db, list(dict.fromkeys(payload.ids)), payload.status)
+    audit_log.record(user, "batch_status", "student", detail={"ids": [r.id for r in rows], "status": payload.status.value})
+    return rows_response(rows)
+
+
+@router.post("/batch/progress", response_model=list[StudentOut])
+async def batch_add_progress(
+    payload: StudentBatchProgress,
+    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(require_role(Role.admin, Role.instructor)),
+):
+    rows = await crud.batch_add_progress(db, list(dict.fromkeys(payload.ids)), payload.delta_hours)
+    audit_log.record(
+        user, "batch_progress", "student", detail={"ids": [r.id for r in rows], "delta_hours": payload.delta_hours},
+    )
+    return rows_response(rows)
+
+
+@router.post("/batch/delete", response_model=StudentBatchDeleteResult)
+async def batch_delete(
+    payload: StudentBatchIds,
+    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(require_role(Role.admin, Role.instructor)),
+):
+    deleted = await crud.batch_delete(db, list(dict.fromkeys(payload.ids)))
+    audit_log.record(user, "batch_delete", "student", detail={"ids": deleted})
+    return StudentBatchDeleteResult(deleted=deleted)
 
 
 # New endpoints without breaking old:
 @router.get("/{student_id}", response_model=StudentOut)
 async def get_student(
     student_id: int,
-    db: AsyncSession = Depends(get_db),
-    _user = Depends(require_role(Role.admin, Role.instructor)),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    _user = Depends(require_role(Role.admin, Role.instructor, from_claims=True)),
 ):
-    st = await crud.get_student(db, student_id)
-    if not st:
+    version = await crud.students_version(db)
+    etag = make_etag(version, request.url.path, request.url.query) if version is not None else None
+    if etag and etag_matches(request, etag):
+        return not_modified(etag)
+    row = await crud.get_student_row(db, student_id, version=version)
+    if row is None:
         raise HTTPException(status_code=404, detail="Student not found")
-    return StudentOut(**st.__dict__)
+    return json_response(row_dict(row), headers=cache_headers(etag))
 
 
 @router.put("/{student_id}", response_model=StudentOut)
@@ -51,23 +340,24 @@ async def update_student(
     student_id: int,
     payload: StudentUpdate,
     db: AsyncSession = Depends(get_db),
-    _user = Depends(require_role(Role.admin, Role.instructor)),
+    user: Principal = Depends(require_role(Role.admin, Role.instructor)),
 ):
-    st = await crud.get_student(db, student_id)
-    if not st:
+    row = await crud.update_student(db, student_id, payload)
+    if row is None:
         raise HTTPException(status_code=404, detail="Student not found")
-    st = await crud.update_student(db, st, payload)
-    return StudentOut(**st.__dict__)
+    detail = payload.model_dump(mode="json", exclude_unset=True)
+    if detail:  # an empty payload only reads the row back
+        audit_log.record(user, "update", "student", row.id, detail=detail)
+    return json_response(row_dict(row))
 
 
 @router.delete("/{student_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_student(
     student_id: int,
     db: AsyncSession = Depends(get_db),
-    _user = Depends(require_role(Role.admin, Role.instructor)),
+    user: Principal = Depends(require_role(Role.admin, Role.instructor)),
 ):
-    st = await crud.get_student(db, student_id)
-    if not st:
+    if not await crud.delete_student(db, student_id):
         raise HTTPException(status_code=404, detail="Student not found")
-    await crud.delete_student(db, st)
+    audit_log.record(user, "delete", "student", student_id)
     return None
@@ -3,17 +3,23 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.audit import audit_log
+from app.core.security import PasswordHashBusy
+from app.core.responses import json_response, row_dict
 from app.db.database import get_db
-from app.dependencies.auth import require_role
+from app.dependencies.auth import Principal, require_role, invalidate_principal
+from app.dependencies.db import get_read_db
 from app.models.enums import Role
 from app.schemas.user import UserPublic, UserCreate, UserUpdateRole
 from app.crud import user as crud
 
 router = APIRouter()
 
+# Admin-only, so the principal comes from the user table rather than token
+# claims: revocation is per worker and a demoted admin must lose access now.
 @router.get("/", response_model=list[UserPublic])
 async def list_users(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _admin = Depends(require_role(Role.admin)),
 ):
     users = await crud.list_users(db)
@@ -24,13 +30,20 @@ async def list_users(
 async def create_user(
     payload: UserCreate,
     db: AsyncSession = Depends(get_db),
-    _admin = Depends(require_role(Role.admin)),
+    admin: Principal = Depends(require_role(Role.admin)),
 ):
-    existing = await crud.get_by_username(db, payload.username)
-    if existing:
+    try:
+        row = await crud.create_user(db, username=payload.username, password=payload.password, role=payload.role)
+    except PasswordHashBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Password hashing is busy, retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    if row is None:
         raise HTTPException(status_code=409, detail="Username already exists")
-    u = await crud.create_user(db, username=payload.username, password=payload.password, role=payload.role)
-    return UserPublic(id=u.id, username=u.username, role=u.role)
+    audit_log.record(admin, "create", "user", row.id, detail={"username": row.username, "role": row.role.value})
+    return json_response(row_dict(row), status_code=status.HTTP_201_CREATED)
 
 
 @router.put("/{user_id}/role", response_model=UserPublic)
@@ -38,23 +51,25 @@ async def update_user_role(
     user_id: int,
     payload: UserUpdateRole,
     db: AsyncSession = Depends(get_db),
-    _admin = Depends(require_role(Role.admin)),
+    admin: Principal = Depends(require_role(Role.admin)),
 ):
-    u = await crud.get_by_id(db, user_id)
-    if not u:
+    row = await crud.update_user_role(db, user_id, payload.role)
+    if row is None:
         raise HTTPException(status_code=404, detail="User not found")
-    u = await crud.update_user_role(db, u, payload.role)
-    return UserPublic(id=u.id, username=u.username, role=u.role)
+    invalidate_principal(row.username)
+    audit_log.record(admin, "update_role", "user", row.id, detail={"username": row.username, "role": row.role.value})
+    return json_response(row_dict(row))
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user(
     user_id: int,
     db: AsyncSession = Depends(get_db),
-    _admin = Depends(require_role(Role.admin)),
+    admin: Principal = Depends(require_role(Role.admin)),
 ):
-    u = await crud.get_by_id(db, user_id)
-    if not u:
+    username = await crud.delete_user(db, user_id)
+    if username is None:
         raise HTTPException(status_code=404, detail="User not found")
-    await crud.delete_user(db, u)
+    invalidate_principal(username)
+    audit_log.record(admin, "delete", "user", user_id, detail={"username": username})
     return None
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any
+
+import orjson
+
+from app.core.config import settings
+from app.core.metrics import AUDIT_EVENTS, AUDIT_QUEUE_DEPTH
+
+logger = logging.getLogger("app.audit")
+
+OVERFLOW_POLICIES = ("spill", "drop_oldest", "drop_newest")
+
+
+class AuditLog:
+    # Write-behind: record() only appends to a bounded in-process buffer, so
+    # a mutation never waits on the audit INSERT. A background task writes
+    # the buffer as multi-row INSERTs every flush_interval or as soon as
+    # flush_batch rows are waiting. stop() drains what is left; rows that
+    # cannot be written (database down, buffer full under "spill") go to the
+    # app.audit logger as JSON instead of being lost.
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        queue_size: int = 10_000,
+        flush_interval: float = 0.5,
+        flush_batch: int = 500,
+        overflow: str = "spill",
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"AUDIT_OVERFLOW must be one of {OVERFLOW_POLICIES}, got {overflow!r}")
+        self.enabled = enabled
+        self.queue_size = queue_size
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self.overflow = overflow
+        self._buffer: deque[dict[str, Any]] = deque()
+        self._wake: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def record(
+        self,
+        actor: Any,
+        action: str,
+        entity: str,
+        entity_id: int | None = None,
+        detail: dict[str, Any] | None = None,
+    ) -> None:
+        # actor: a Principal (or anything with id/username). Batch operations
+        # record one event with entity_id None and the ids in detail.
+        if not self.enabled:
+            return
+        self._append({
+            "occurred_at": datetime.now(timezone.utc),
+            "actor_id": getattr(actor, "id", None),
+            "actor": getattr(actor, "username", None),
+            "action": action,
+            "entity": entity,
+            "entity_id": entity_id,
+            "detail": detail,
+        })
+        AUDIT_QUEUE_DEPTH.set(len(self._buffer))
+        if len(self._buffer) >= self.flush_batch and self._wake is not None:
+            self._wake.set()
+
+    def _append(self, row: dict[str, Any]) -> None:
+        if len(self._buffer) < self.queue_size:
+            self._buffer.append(row)
+            return
+        if self.overflow == "spill":
+            self._spill([row])
+        elif self.overflow == "drop_oldest":
+            self._buffer.popleft()
+            self._buffer.append(row)
+            AUDIT_EVENTS.labels("dropped").inc()
+        else:
+            AUDIT_EVENTS.labels("dropped").inc()
+
+    def _spill(self, rows: list[dict[str, Any]]) -> None:
+        for row in rows:
+            logger.warning(orjson.dumps({"event": "audit", **row}).decode())
+        AUDIT_EVENTS.labels("spilled").inc(len(rows))
+
+    def start(self) -> None:
+        if self._task is None and self.enabled:
+            self._stopping = False
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="audit-flusher")
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        if self._task is not None:
+            self._stopping = True
+            self._wake.set()
+            try:
+                await asyncio.wait_for(self._task, timeout)
+            except Exception:
+                logger.exception("audit flusher did not stop cleanly")
+            self._task = None
+        # Whatever could not be written is still recorded, in the log.
+        if self._buffer:
+            self._spill(list(self._buffer))
+            self._buffer.clear()
+            AUDIT_QUEUE_DEPTH.set(0)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            written = await self.flush()
+            if self._stopping and (not self._buffer or not written):
+                return
+
+    async def flush(self) -> bool:
+        # Writes everything buffered in flush_batch chunks. On a database
+        # error the chunk goes back to the front of the buffer for the next
+        # tick and False is returned.
+        from sqlalchemy import insert
+
+        from app.db.database import engine
+        from app.models.audit_log import AuditEntry
+
+        while self._buffer:
+            batch = [self._buffer.popleft() for _ in range(min(self.flush_batch, len(self._buffer)))]
+            try:
+                async with engine.begin() as conn:
+                    await conn.execute(insert(AuditEntry.__table__), batch)
+            except asyncio.CancelledError:
+                # stop() timed out mid-write: keep the rows so they get spilled.
+                self._buffer.extendleft(reversed(batch))
+                raise
+            except Exception:
+                logger.exception("audit flush of %d rows failed; will retry", len(batch))
+                room = self.queue_size - len(self._buffer)
+                self._buffer.extendleft(reversed(batch[:room]))
+                if len(batch) > room:
+                    self._spill(batch[room:])
+                AUDIT_QUEUE_DEPTH.set(len(self._buffer))
+                return False
+            AUDIT_EVENTS.labels("written").inc(len(batch))
+            AUDIT_QUEUE_DEPTH.set(len(self._buffer))
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "queued": len(self._buffer),
+            "queue_size": self.queue_size,
+            "overflow": self.overflow,
+            "running": self._task is not None and not self._task.done(),
+        }
+
+
+audit_log = AuditLog(
+    enabled=settings.audit_enabled,
+    queue_size=settings.audit_queue_size,
+    flush_interval=settings.audit_flush_interval_ms / 1000,
+    flush_batch=settings.audit_flush_batch,
+    overflow=settings.audit_overflow,
+)
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+# Bodies worth compressing; images, archives and fonts are already compressed.
+_COMPRESSIBLE = (
+    "text/", "application/json", "application/x-ndjson", "application/javascript",
+    "application/xml", "application/problem+json", "image/svg+xml",
+)
+
+
+def accepted_encodings(headers: Headers) -> dict[str, float]:
+    # "br;q=1.0, gzip;q=0.8, *;q=0" -> {"br": 1.0, "gzip": 0.8, "*": 0.0}
+    found: dict[str, float] = {}
+    for part in headers.get("accept-encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        found[name.strip().lower()] = q
+    return found
+
+
+def choose_encoding(headers: Headers) -> str | None:
+    accepted = accepted_encodings(headers)
+    for name in ("br", "gzip") if brotli is not None else ("gzip",):
+        if accepted.get(name, accepted.get("*", 0.0)) > 0:
+            return name
+    return None
+
+
+class _Encoder:
+    def __init__(self, encoding: str, *, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._c = brotli.Compressor(quality=brotli_quality)
+            self._process, self._flush, self._finish = self._c.process, self._c.flush, self._c.finish
+        else:
+            self._c = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._process = self._c.compress
+            self._flush = lambda: self._c.flush(zlib.Z_SYNC_FLUSH)
+            self._finish = self._c.flush
+
+    def chunk(self, data: bytes) -> bytes:
+        # Sync-flush so each streamed chunk reaches the client now rather
+        # than sitting in the compressor's window.
+        return self._process(data) + self._flush()
+
+    def last(self, data: bytes) -> bytes:
+        return self._process(data) + self._finish()
+
+
+class CompressionMiddleware:
+    # Pure ASGI brotli/gzip. Whole bodies below minimum_size go out as-is;
+    # streamed bodies are compressed chunk by chunk. Event streams, responses
+    # that already carry a Content-Encoding and non-text types pass through.
+
+    def __init__(
+        self, app: ASGIApp, *, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        encoder: _Encoder | None = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, encoder, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if (
+                    "content-encoding" in headers
+                    or content_type.startswith("text/event-stream")
+                    or not content_type.startswith(_COMPRESSIBLE)
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message  # held until we see the first body chunk
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more = message.get("more_body", False)
+            if encoder is None:
+                headers = MutableHeaders(scope=start)
+                if not more and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                encoder = _Encoder(encoding, gzip_level=self.gzip_level, brotli_quality=self.brotli_quality)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if "etag" in headers and not headers["etag"].startswith("W/"):
+                    headers["ETag"] = "W/" + headers["etag"]
+                if more:
+                    del headers["Content-Length"]
+                    await send(start)
+                    await send({"type": "http.response.body", "body": encoder.chunk(body), "more_body": True})
+                else:
+                    compressed = encoder.last(body)
+                    headers["Content-Length"] = str(len(compressed))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": compressed})
+                return
+            data = encoder.chunk(body) if more else encoder.last(body)
+            await send({"type": "http.response.body", "body": data, "more_body": more})
+
+        await self.app(scope, receive, send_compressed)
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import ipaddress
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field
+from pydantic import Field, field_validator
 from typing import List
 
 
@@ -14,9 +16,104 @@ class Settings(BaseSettings):
     secret_key: str = Field(alias="SECRET_KEY")
     access_token_expire_minutes: int = Field(default=60, alias="ACCESS_TOKEN_EXPIRE_MINUTES")
     algorithm: str = "HS256"
+    # Authenticated-user cache (per worker). 0 disables.
+    principal_cache_ttl_seconds: float = Field(default=30.0, alias="PRINCIPAL_CACHE_TTL_SECONDS")
+    principal_cache_max_size: int = Field(default=10_000, alias="PRINCIPAL_CACHE_MAX_SIZE")
+    # Verified JWT claims, keyed by token digest and bounded by exp. 0 disables.
+    token_cache_max_size: int = Field(default=10_000, alias="TOKEN_CACHE_MAX_SIZE")
+    # Read-only routes may authorize from token claims alone (no user lookup)
+    # while the token is younger than auth_claims_max_age_seconds and was not
+    # issued before a role change/delete seen by this worker.
+    auth_trust_claims: bool = Field(default=False, alias="AUTH_TRUST_CLAIMS")
+    auth_claims_max_age_seconds: int = Field(default=300, alias="AUTH_CLAIMS_MAX_AGE_SECONDS")
+    # bcrypt runs off the event loop: "thread" or "process" pool
+    password_hash_executor: str = Field(default="thread", alias="PASSWORD_HASH_EXECUTOR")
+    password_hash_workers: int = Field(default=4, alias="PASSWORD_HASH_WORKERS")
+    # hashes waiting for a worker beyond this are rejected with 503
+    password_hash_max_queue: int = Field(default=32, alias="PASSWORD_HASH_MAX_QUEUE")
 
     # Database
     database_url: str = Field(alias="DATABASE_URL")
+    # Optional read replica for read-only endpoints. After a write, that
+    # user's reads stay on the primary for read_your_writes_seconds.
+    database_read_url: str | None = Field(default=None, alias="DATABASE_READ_URL")
+    read_your_writes_seconds: float = Field(default=5.0, alias="READ_YOUR_WRITES_SECONDS")
+    # Pool (ignored in dev, which uses NullPool)
+    db_pool_size: int = Field(default=5, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=10, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(default=30.0, alias="DB_POOL_TIMEOUT")
+    db_pool_recycle: int = Field(default=1800, alias="DB_POOL_RECYCLE")
+    db_pool_pre_ping: bool = Field(default=True, alias="DB_POOL_PRE_PING")
+    # asyncpg only; set the cache size to 0 behind pgbouncer in transaction mode
+    db_statement_cache_size: int = Field(default=100, alias="DB_STATEMENT_CACHE_SIZE")
+    db_statement_timeout_ms: int = Field(default=0, alias="DB_STATEMENT_TIMEOUT_MS")
+    db_slow_acquire_ms: float = Field(default=100.0, alias="DB_SLOW_ACQUIRE_MS")
+
+    # Startup prewarm: open this many pool connections (capped at the pool
+    # size), load bcrypt in the hash pool and build the OpenAPI document
+    # before serving. Failures are logged, never fatal.
+    prewarm_enabled: bool = Field(default=True, alias="PREWARM_ENABLED")
+    prewarm_db_connections: int = Field(default=5, alias="PREWARM_DB_CONNECTIONS")
+    prewarm_timeout_seconds: float = Field(default=10.0, alias="PREWARM_TIMEOUT_SECONDS")
+
+    # Pagination
+    students_max_page_size: int = Field(default=500, alias="STUDENTS_MAX_PAGE_SIZE")
+    students_import_max_rows: int = Field(default=10_000, alias="STUDENTS_IMPORT_MAX_ROWS")
+    students_batch_max_ids: int = Field(default=1000, alias="STUDENTS_BATCH_MAX_IDS")
+
+    # Dashboard: "scan" groups students by status, "summary" reads the
+    # trigger-maintained student_status_counts table (migration 0002). The
+    # triggers run under either setting, so switching needs no backfill.
+    dashboard_stats_source: str = Field(default="scan", alias="DASHBOARD_STATS_SOURCE")
+    dashboard_stats_ttl_seconds: float = Field(default=5.0, alias="DASHBOARD_STATS_TTL_SECONDS")
+    # Share one in-flight query between concurrent identical hot reads
+    # (dashboard stats, student by id) within a worker.
+    singleflight_enabled: bool = Field(default=True, alias="SINGLEFLIGHT_ENABLED")
+
+    # Drive session log (migration 0006)
+    drive_sessions_ingest_max_rows: int = Field(default=5000, alias="DRIVE_SESSIONS_INGEST_MAX_ROWS")
+    drive_sessions_history_max_days: int = Field(default=366, alias="DRIVE_SESSIONS_HISTORY_MAX_DAYS")
+
+    # Server-Sent Events change feed (per worker)
+    events_queue_size: int = Field(default=100, alias="EVENTS_QUEUE_SIZE")
+    events_max_subscribers: int = Field(default=1000, alias="EVENTS_MAX_SUBSCRIBERS")
+    events_heartbeat_seconds: float = Field(default=15.0, alias="EVENTS_HEARTBEAT_SECONDS")
+
+    # Rate limiting: "memory" (per worker) or "postgres" (shared, migration 0005)
+    rate_limit_enabled: bool = Field(default=True, alias="RATE_LIMIT_ENABLED")
+    rate_limit_backend: str = Field(default="memory", alias="RATE_LIMIT_BACKEND")
+    rate_limit_default: str = Field(default="120/minute", alias="RATE_LIMIT_DEFAULT")
+    rate_limit_login: str = Field(default="10/minute", alias="RATE_LIMIT_LOGIN")
+    # comma-separated IPs/CIDRs whose X-Forwarded-For is believed
+    trusted_proxies: str = Field(default="", alias="TRUSTED_PROXIES")
+
+    # Write-behind audit log (migration 0007). When the queue is full:
+    # "spill" logs the event as JSON to the app.audit logger, "drop_oldest"
+    # or "drop_newest" discard one (counted in audit_events_total).
+    audit_enabled: bool = Field(default=True, alias="AUDIT_ENABLED")
+    audit_queue_size: int = Field(default=10_000, alias="AUDIT_QUEUE_SIZE")
+    audit_flush_interval_ms: int = Field(default=500, alias="AUDIT_FLUSH_INTERVAL_MS")
+    audit_flush_batch: int = Field(default=500, alias="AUDIT_FLUSH_BATCH")
+    audit_overflow: str = Field(default="spill", alias="AUDIT_OVERFLOW")
+
+    # Request timing middleware (Server-Timing headers + JSON logs)
+    timing_enabled: bool = Field(default=False, alias="TIMING_ENABLED")
+    timing_sample_rate: float = Field(default=0.1, alias="TIMING_SAMPLE_RATE")
+
+    # Prometheus /api/metrics (see app.core.metrics for multi-worker setup)
+    metrics_enabled: bool = Field(default=True, alias="METRICS_ENABLED")
+    # Bearer token for scrapers/probes on /api/metrics and /api/health/*
+    # details; admins can always use their own token. Unset: admins only.
+    monitoring_token: str | None = Field(default=None, alias="MONITORING_TOKEN")
+
+    # Response compression (brotli if installed, else gzip)
+    compression_enabled: bool = Field(default=True, alias="COMPRESSION_ENABLED")
+    compression_min_size: int = Field(default=1024, alias="COMPRESSION_MIN_SIZE")
+    compression_gzip_level: int = Field(default=6, alias="COMPRESSION_GZIP_LEVEL")
+    compression_brotli_quality: int = Field(default=4, alias="COMPRESSION_BROTLI_QUALITY")
+
+    # Built frontend (vite build output) served at / when set
+    frontend_dist_dir: str | None = Field(default=None, alias="FRONTEND_DIST_DIR")
 
     # CORS
     cors_origins: str = Field(default="", alias="CORS_ORIGINS")
@@ -26,6 +123,24 @@ class Settings(BaseSettings):
     seed_admin_password: str = Field(default="change_me", alias="SEED_ADMIN_PASSWORD")
     seed_admin_role: str = Field(default="admin", alias="SEED_ADMIN_ROLE")
 
+    @field_validator("trusted_proxies")
+    @classmethod
+    def _check_trusted_proxies(cls, value: str) -> str:
+        # Fail at startup, not with a 500 on every request.
+        for p in value.split(","):
+            if p.strip():
+                try:
+                    ipaddress.ip_network(p.strip(), strict=False)
+                except ValueError as exc:
+                    raise ValueError(f"TRUSTED_PROXIES: {exc}") from None
+        return value
+
+    @property
+    def trusted_proxy_networks(self) -> tuple[ipaddress.IPv4Network | ipaddress.IPv6Network, ...]:
+        return tuple(
+            ipaddress.ip_network(p.strip(), strict=False) for p in self.trusted_proxies.split(",") if p.strip()
+        )
+
     @property
     def cors_origins_list(self) -> List[str]:
         if not self.cors_origins:
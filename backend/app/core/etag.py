@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import hashlib
+
+from fastapi import Request, Response
+
+
+# Weak validators derived from a table version plus whatever else shapes the
+# body (path, query). Cheap to compute before any rows are loaded.
+def make_etag(version: int, *parts: str) -> str:
+    digest = hashlib.blake2b("\x1f".join(parts).encode(), digest_size=8).hexdigest()
+    return f'W/"{version}-{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in header.split(","))
+
+
+def cache_headers(etag: str | None) -> dict[str, str] | None:
+    # private: responses are per-user authorized; no-cache: always revalidate.
+    if etag is None:
+        return None
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag))
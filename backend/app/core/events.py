@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import orjson
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+STUDENTS_CHANNEL = "students_changes"
+
+# NOTIFY payloads are capped at 8000 bytes; larger batches are announced
+# without ids and clients refetch.
+_MAX_PAYLOAD = 7000
+
+
+def change_payload(op: str, ids: list[int] | None) -> str:
+    payload = orjson.dumps({"op": op, "ids": ids})
+    if len(payload) > _MAX_PAYLOAD:
+        payload = orjson.dumps({"op": op, "ids": None})
+    return payload.decode()
+
+
+class SubscriberLimit(Exception):
+    pass
+
+
+class ChangeFeed:
+    # One LISTEN connection per worker, fanned out to per-subscriber bounded
+    # queues. A subscriber that falls behind (queue full) or outlives the
+    # LISTEN connection receives None, meaning "resync and reconnect"; it is
+    # never allowed to buffer without bound.
+
+    def __init__(self, channel: str, *, queue_size: int, max_subscribers: int):
+        self.channel = channel
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._subscribers: set[asyncio.Queue[str | None]] = set()
+        self._conn = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    async def _ensure_listening(self) -> None:
+        async with self._lock:
+            if self._conn is not None and not self._conn.is_closed():
+                return
+            import asyncpg
+
+            url = make_url(settings.database_url).set(drivername="postgresql")
+            self._conn = await asyncpg.connect(url.render_as_string(hide_password=False))
+            self._conn.add_termination_listener(self._on_terminated)
+            await self._conn.add_listener(self.channel, self._on_notify)
+
+    def _kick(self, queue: asyncio.Queue[str | None]) -> None:
+        self._subscribers.discard(queue)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    def _on_notify(self, conn, pid, channel, payload: str) -> None:
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                self._kick(queue)
+
+    def _on_terminated(self, conn) -> None:
+        logger.warning("change feed LISTEN connection lost; resyncing %d subscribers", len(self._subscribers))
+        self._conn = None
+        for queue in list(self._subscribers):
+            self._kick(queue)
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[asyncio.Queue[str | None]]:
+        if len(self._subscribers) >= self.max_subscribers:
+            raise SubscriberLimit()
+        await self._ensure_listening()
+        queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers.discard(queue)
+
+    async def close(self) -> None:
+        for queue in list(self._subscribers):
+            self._kick(queue)
+        if self._conn is not None and not self._conn.is_closed():
+            await self._conn.close()
+        self._conn = None
+
+
+student_changes = ChangeFeed(
+    STUDENTS_CHANNEL,
+    queue_size=settings.events_queue_size,
+    max_subscribers=settings.events_max_subscribers,
+)
@@ -1,5 +1,207 @@
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from __future__ import annotations
+
+import ipaddress
+import logging
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Protocol
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy import text
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@dataclass(frozen=True, slots=True)
+class Rate:
+    limit: int
+    period: int
+
+    @classmethod
+    def parse(cls, spec: str) -> "Rate":
+        # "10/minute", "120/minute", "5/second", "1000/day"
+        count, _, unit = spec.partition("/")
+        unit = unit.strip().lower().rstrip("s")
+        if unit not in _PERIODS:
+            raise ValueError(f"unknown rate period in {spec!r}")
+        return cls(limit=int(count), period=_PERIODS[unit])
+
+
+def _sliding_estimate(rate: Rate, now: float, current: int, previous: int) -> tuple[bool, float]:
+    # Sliding-window counter: the previous fixed window's hits are weighted
+    # by how much of it still overlaps the trailing period. O(1) state per key.
+    elapsed = (now % rate.period) / rate.period
+    if previous * (1 - elapsed) + current < rate.limit:
+        return True, 0.0
+    if current >= rate.limit:
+        return False, (1 - elapsed) * rate.period
+    needed = 1 - (rate.limit - current) / previous
+    return False, max(needed - elapsed, 0.0) * rate.period
+
+
+class RateLimitBackend(Protocol):
+    async def hit(self, key: str, rate: Rate) -> tuple[bool, float]:
+        """Record a hit; return (allowed, retry_after_seconds)."""
+
+
+class MemoryBackend:
+    # Per worker. Keys are spread over independently locked shards so
+    # threadpool callers do not serialise on one lock; on the event loop the
+    # locks are uncontended.
+
+    def __init__(self, *, shards: int = 64, max_keys_per_shard: int = 10_000):
+        self._shards = [(threading.Lock(), {}) for _ in range(shards)]
+        self._max_keys = max_keys_per_shard
+
+    async def hit(self, key: str, rate: Rate) -> tuple[bool, float]:
+        return self.hit_sync(key, rate)
+
+    def hit_sync(self, key: str, rate: Rate) -> tuple[bool, float]:
+        lock, table = self._shards[hash(key) % len(self._shards)]
+        now = time.time()
+        window = int(now // rate.period)
+        with lock:
+            entry = table.get(key)  # [window, current hits, previous window hits]
+            if entry is None or entry[0] < window - 1:
+                entry = [window, 0, 0]
+                if len(table) >= self._max_keys:
+                    self._prune(table, window)
+                table[key] = entry
+            elif entry[0] == window - 1:
+                entry[:] = [window, 0, entry[1]]
+            allowed, retry_after = _sliding_estimate(rate, now, entry[1], entry[2])
+            if allowed:
+                entry[1] += 1
+            return allowed, retry_after
+
+    def _prune(self, table: dict, window: int) -> None:
+        # Drop keys idle for a full window; if that is not enough, the
+        # longest-lived keys (dict order) go first.
+        for k in [k for k, e in table.items() if e[0] < window - 1]:
+            del table[k]
+        while len(table) >= self._max_keys:
+            table.pop(next(iter(table)))
+
+
+class PostgresBackend:
+    # Shared across workers and hosts: one upsert per hit that also reads the
+    # previous window, against the UNLOGGED table from migration 0005. A
+    # denied hit is taken back with a second statement, so like the memory
+    # backend only allowed requests count. Fails open (with a warning) if the
+    # database is unavailable.
+
+    _HIT = text(
+        """
+        WITH cur AS (
+            INSERT INTO rate_limit_counters (key, window_start, hits, expires_at)
+            VALUES (:key, :window, 1, to_timestamp(:expires))
+            ON CONFLICT (key, window_start) DO UPDATE SET hits = rate_limit_counters.hits + 1
+            RETURNING hits
+        )
+        SELECT cur.hits, coalesce(
+            (SELECT hits FROM rate_limit_counters WHERE key = :key AND window_start = :window - 1), 0
+        ) FROM cur
+        """
+    )
+    _UNDO = text(
+        "UPDATE rate_limit_counters SET hits = hits - 1 WHERE key = :key AND window_start = :window"
+    )
+    _PURGE = text("DELETE FROM rate_limit_counters WHERE expires_at < now()")
+
+    async def hit(self, key: str, rate: Rate) -> tuple[bool, float]:
+        from app.db.database import autocommit_engine
+
+        now = time.time()
+        window = int(now // rate.period)
+        try:
+            async with autocommit_engine.connect() as conn:
+                row = (await conn.execute(self._HIT, {
+                    "key": key, "window": window, "expires": (window + 2) * rate.period,
+                })).one()
+                # The upsert already counted this hit; judge it against the rest.
+                allowed, retry_after = _sliding_estimate(rate, now, row[0] - 1, row[1])
+                if not allowed:
+                    await conn.execute(self._UNDO, {"key": key, "window": window})
+                if random.random() < 0.001:
+                    await conn.execute(self._PURGE)
+        except Exception:
+            logger.warning("rate limit backend unavailable; allowing request", exc_info=True)
+            return True, 0.0
+        return allowed, retry_after
+
+
+# Parsed once at import; TRUSTED_PROXIES is validated when settings load.
+_TRUSTED_NETWORKS = settings.trusted_proxy_networks
+
+
+@lru_cache(maxsize=4096)
+def _is_trusted(host: str) -> bool:
+    try:
+        addr = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(addr in net for net in _TRUSTED_NETWORKS)
+
+
+def client_ip(request: Request) -> str:
+    # Walk X-Forwarded-For from the right, skipping our own proxies; only
+    # believe the header when the direct peer is one of them.
+    peer = request.client.host if request.client else "unknown"
+    if not _is_trusted(peer):
+        return peer
+    forwarded = request.headers.get("x-forwarded-for")
+    if not forwarded:
+        return peer
+    hops = [h.strip() for h in forwarded.split(",") if h.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted(hop):
+            return hop
+    return hops[0] if hops else peer
+
+
+class RateLimiter:
+    def __init__(self, backend: RateLimitBackend, *, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+
+    def limit(self, spec: str, *, scope: str | None = None):
+        # FastAPI dependency. Without a scope each route gets its own bucket
+        # per client (keyed by route template, not raw path).
+        rate = Rate.parse(spec)
+
+        async def _dep(request: Request) -> None:
+            if not self.enabled:
+                return
+            if scope is None:
+                route = request.scope.get("route")
+                bucket = getattr(route, "path", request.url.path)
+            else:
+                bucket = scope
+            allowed, retry_after = await self.backend.hit(f"{bucket}|{client_ip(request)}", rate)
+            if not allowed:
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail=f"Rate limit exceeded: {spec}",
+                    headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+                )
+
+        return _dep
+
+
+def _make_backend() -> RateLimitBackend:
+    if settings.rate_limit_backend == "postgres":
+        return PostgresBackend()
+    return MemoryBackend()
+
 
 # Conservative defaults. Override per-route as needed.
-limiter = Limiter(key_func=get_remote_address, default_limits=["120/minute"])
+limiter = RateLimiter(_make_backend(), enabled=settings.rate_limit_enabled)
+default_limit = limiter.limit(settings.rate_limit_default)
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import os
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+# With several workers, set PROMETHEUS_MULTIPROC_DIR (an empty directory,
+# wiped on deploy) before the app is imported: each worker then writes its
+# samples to mmap'd files there and any worker can serve the aggregate.
+# Updates are per-process and uncontended; nothing is shared at write time.
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+
+class _NoopMetric:
+    # Stands in for every metric when METRICS_ENABLED is off, so
+    # prometheus_client is never imported and updates cost a method call.
+    def labels(self, *args, **kwargs) -> "_NoopMetric":
+        return self
+
+    def inc(self, *args, **kwargs) -> None:
+        pass
+
+    dec = set = observe = inc
+
+
+class _LazyMetric:
+    # Creates the prometheus_client metric on first use, so importing the app
+    # does not import prometheus_client; the first request (or scrape) does.
+    __slots__ = ("_spec", "_metric")
+
+    def __init__(self, kind: str, args: tuple, kwargs: dict):
+        self._spec = (kind, args, kwargs)
+        self._metric = None
+
+    def get(self):
+        if self._metric is None:
+            import prometheus_client
+
+            kind, args, kwargs = self._spec
+            self._metric = getattr(prometheus_client, kind)(*args, **kwargs)
+        return self._metric
+
+    def labels(self, *args, **kwargs):
+        return self.get().labels(*args, **kwargs)
+
+    def inc(self, *args, **kwargs) -> None:
+        self.get().inc(*args, **kwargs)
+
+    def dec(self, *args, **kwargs) -> None:
+        self.get().dec(*args, **kwargs)
+
+    def set(self, *args, **kwargs) -> None:
+        self.get().set(*args, **kwargs)
+
+    def observe(self, *args, **kwargs) -> None:
+        self.get().observe(*args, **kwargs)
+
+
+_lazy: list[_LazyMetric] = []
+
+
+def _metric(kind: str, *args, **kwargs):
+    if not settings.metrics_enabled:
+        return _NoopMetric()
+    metric = _LazyMetric(kind, args, kwargs)
+    _lazy.append(metric)
+    return metric
+
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HTTP_REQUESTS = _metric(
+    "Counter", "http_requests_total", "HTTP requests by route template and status.", ["method", "route", "status"],
+)
+HTTP_LATENCY = _metric(
+    "Histogram", "http_request_duration_seconds", "Time to complete HTTP requests.", ["method", "route"],
+    buckets=_LATENCY_BUCKETS,
+)
+HTTP_IN_FLIGHT = _metric("Gauge", "http_requests_in_flight", "HTTP requests being served.", multiprocess_mode="livesum")
+
+DB_POOL_CHECKED_OUT = _metric(
+    "Gauge", "db_pool_checked_out", "Pooled connections in use.", ["engine"], multiprocess_mode="livesum",
+)
+DB_POOL_SIZE = _metric("Gauge", "db_pool_size", "Pooled connections held open.", ["engine"], multiprocess_mode="livesum")
+DB_POOL_ACQUIRE = _metric(
+    "Histogram", "db_pool_acquire_seconds", "Time waiting to check out a pooled connection.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+
+PASSWORD_HASH_IN_FLIGHT = _metric(
+    "Gauge", "password_hash_in_flight", "bcrypt operations running on the hash pool.", multiprocess_mode="livesum",
+)
+PASSWORD_HASH_WAITING = _metric(
+    "Gauge", "password_hash_waiting", "bcrypt operations queued for the hash pool.", multiprocess_mode="livesum",
+)
+
+AUDIT_EVENTS = _metric(
+    "Counter", "audit_events_total", "Audit events by outcome (written, spilled, dropped).", ["outcome"],
+)
+AUDIT_QUEUE_DEPTH = _metric("Gauge", "audit_queue_depth", "Audit events waiting to be flushed.", multiprocess_mode="livesum")
+
+
+_instrumented: set[int] = set()
+
+
+def instrument_pool(engine: AsyncEngine, name: str) -> None:
+    sync_engine = engine.sync_engine
+    if id(sync_engine) in _instrumented:
+        return
+    _instrumented.add(id(sync_engine))
+
+    def _update(returning: int) -> None:
+        pool = sync_engine.pool
+        if hasattr(pool, "checkedout"):
+            # checkin fires before the pool books the connection back in.
+            checked_out = pool.checkedout() - returning
+            DB_POOL_CHECKED_OUT.labels(name).set(checked_out)
+            DB_POOL_SIZE.labels(name).set(pool.checkedin() + pool.checkedout())
+
+    event.listen(sync_engine, "checkout", lambda *_: _update(0))
+    event.listen(sync_engine, "checkin", lambda *_: _update(1))
+
+
+def render_latest() -> tuple[bytes, str]:
+    from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest, multiprocess
+
+    # Register every metric, so the exposition lists the ones not used yet.
+    for metric in _lazy:
+        metric.get()
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    if MULTIPROCESS and settings.metrics_enabled:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class MetricsMiddleware:
+    # Pure ASGI. Labels use the matched route template (e.g.
+    # /api/students/{student_id}) so cardinality is bounded by the route table.
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            HTTP_LATENCY.labels(method, template).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(method, template, str(status_code)).inc()
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import hashlib
+
+import orjson
+from fastapi import FastAPI, Request
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
+from starlette.responses import HTMLResponse, Response
+
+from app.core.etag import etag_matches
+
+OPENAPI_URL = "/openapi.json"
+
+
+def openapi_bytes(app: FastAPI) -> bytes:
+    # Build and encode the schema once per process; app.openapi() already
+    # caches the dict, this also caches the JSON so requests only copy bytes.
+    body = getattr(app.state, "openapi_bytes", None)
+    if body is None:
+        body = orjson.dumps(app.openapi())
+        app.state.openapi_bytes = body
+        app.state.openapi_etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    return body
+
+
+def install_openapi(app: FastAPI) -> None:
+    # Replaces FastAPI's built-in /openapi.json, /docs and /redoc (create the
+    # app with openapi_url=None) with the same pages served from the cache.
+
+    @app.get(OPENAPI_URL, include_in_schema=False)
+    async def openapi_json(request: Request) -> Response:
+        body = openapi_bytes(app)
+        etag = app.state.openapi_etag
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        # Weak comparison: compression turns the ETag into W/"...".
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+    @app.get("/docs", include_in_schema=False)
+    async def swagger_ui() -> HTMLResponse:
+        return get_swagger_ui_html(openapi_url=OPENAPI_URL, title=f"{app.title} - Swagger UI")
+
+    @app.get("/redoc", include_in_schema=False)
+    async def redoc() -> HTMLResponse:
+        return get_redoc_html(openapi_url=OPENAPI_URL, title=f"{app.title} - ReDoc")
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import base64
+from typing import Any
+
+import orjson
+
+
+# Opaque keyset cursors: urlsafe base64 of a small JSON object. Clients must
+# treat them as tokens; the contents may change between releases.
+def encode_cursor(data: dict[str, Any]) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps(data)).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = orjson.loads(raw)
+    except Exception as exc:
+        raise ValueError("malformed cursor") from exc
+    if not isinstance(data, dict):
+        raise ValueError("malformed cursor")
+    return data
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+import orjson
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import Row
+
+from app.core.timing import span
+
+
+# Fast path for column rows: encode straight to JSON bytes. Returning a
+# Response skips FastAPI's response_model re-validation; routes still declare
+# response_model so the OpenAPI schema is unchanged. Callers are responsible
+# for selecting exactly the schema's fields.
+def row_dict(row: Row) -> dict[str, Any]:
+    return row._asdict()
+
+
+def json_response(content: Any, status_code: int = 200, headers: dict[str, str] | None = None) -> Response:
+    with span("ser"):
+        body = orjson.dumps(content)
+    return Response(body, status_code=status_code, media_type="application/json", headers=headers)
+
+
+def rows_response(rows: Iterable[Row], status_code: int = 200, headers: dict[str, str] | None = None) -> Response:
+    with span("ser"):
+        body = orjson.dumps([r._asdict() for r in rows])
+    return Response(body, status_code=status_code, media_type="application/json", headers=headers)
+
+
+class TimedORJSONResponse(ORJSONResponse):
+    # Default response class; attributes render time to the "ser" span.
+    def render(self, content: Any) -> bytes:
+        with span("ser"):
+            return super().render(content)
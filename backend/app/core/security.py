@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
 from jose import jwt
 from passlib.context import CryptContext
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.metrics import PASSWORD_HASH_IN_FLIGHT, PASSWORD_HASH_WAITING
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -19,11 +25,116 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
-def create_access_token(*, subject: str, role: str, expires_minutes: Optional[int] = None) -> str:
-    expire = datetime.now(timezone.utc) + timedelta(minutes=expires_minutes or settings.access_token_expire_minutes)
-    to_encode: dict[str, Any] = {"sub": subject, "role": role, "exp": expire}
+class PasswordHashBusy(Exception):
+    pass
+
+
+# bcrypt is deliberately slow (~100-250 ms); never run it on the event loop.
+# A semaphore caps in-flight hashes at the pool size and a bounded waiting
+# count provides backpressure, so login bursts only degrade login.
+_hash_executor: Executor | None = None
+_hash_slots: asyncio.Semaphore | None = None
+_hash_waiting = 0
+
+
+def _get_hash_executor() -> Executor:
+    global _hash_executor
+    if _hash_executor is None:
+        workers = settings.password_hash_workers
+        if settings.password_hash_executor == "process":
+            # Imported here: pulls in multiprocessing, which the default
+            # thread pool does not need.
+            from concurrent.futures import ProcessPoolExecutor
+
+            _hash_executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            _hash_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwhash")
+    return _hash_executor
+
+
+async def _run_hash(fn, *args):
+    global _hash_slots, _hash_waiting
+    if _hash_slots is None:
+        _hash_slots = asyncio.Semaphore(settings.password_hash_workers)
+    if _hash_slots.locked() and _hash_waiting >= settings.password_hash_max_queue:
+        raise PasswordHashBusy()
+    _hash_waiting += 1
+    PASSWORD_HASH_WAITING.inc()
+    try:
+        await _hash_slots.acquire()
+    finally:
+        _hash_waiting -= 1
+        PASSWORD_HASH_WAITING.dec()
+    PASSWORD_HASH_IN_FLIGHT.inc()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_hash_executor(), fn, *args)
+    finally:
+        PASSWORD_HASH_IN_FLIGHT.dec()
+        _hash_slots.release()
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_hash(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_hash(verify_password, plain_password, hashed_password)
+
+
+def _load_hash_backend() -> None:
+    # Minimum-cost bcrypt hash: imports and selects the backend in the worker.
+    pwd_context.handler("bcrypt").using(rounds=4).hash("prewarm")
+
+
+async def warm_password_hashing() -> None:
+    # Startup: spin up the pool's workers and load bcrypt in each, so the
+    # first logins pay only for the hash itself.
+    loop = asyncio.get_running_loop()
+    executor = _get_hash_executor()
+    await asyncio.gather(*(
+        loop.run_in_executor(executor, _load_hash_backend) for _ in range(settings.password_hash_workers)
+    ))
+
+
+def shutdown_password_hashing() -> None:
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+
+
+def create_access_token(
+    *, subject: str, role: str, user_id: Optional[int] = None, expires_minutes: Optional[int] = None,
+) -> str:
+    now = datetime.now(timezone.utc)
+    expire = now + timedelta(minutes=expires_minutes or settings.access_token_expire_minutes)
+    to_encode: dict[str, Any] = {"sub": subject, "role": role, "iat": now, "exp": expire}
+    if user_id is not None:
+        to_encode["uid"] = user_id
     return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
 
 
+# Verified claims keyed by the token's digest, so a session reusing one token
+# pays for parsing + HMAC once. Entries never outlive the token's exp.
+_token_cache: TTLCache[bytes, dict[str, Any]] = TTLCache(
+    maxsize=settings.token_cache_max_size,
+    ttl=settings.access_token_expire_minutes * 60,
+)
+
+
 def decode_token(token: str) -> dict[str, Any]:
-    return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+    key = hashlib.sha256(token.encode()).digest()
+    claims = _token_cache.get(key)
+    if claims is not None:
+        return claims
+    claims = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        remaining = exp - time.time()
+        if remaining > 0:
+            _token_cache.set(key, claims, ttl=remaining)
+    return claims
+
+
+def token_cache_stats() -> dict[str, int]:
+    return _token_cache.stats()
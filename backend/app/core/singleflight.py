@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+def _retrieve(task: asyncio.Task) -> None:
+    # Mark a failure as retrieved even if every waiter was cancelled, so it
+    # is not reported as "never retrieved" at garbage collection.
+    if not task.cancelled():
+        task.exception()
+
+
+def singleflight(fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    # Coalesces concurrent identical calls of an async crud read within this
+    # worker: the first caller (leader) runs fn in its own task on its
+    # session, later callers with the same key await that task. The key is
+    # the function, the session's bind (so primary and replica reads never
+    # mix) and the remaining arguments, normalised through the signature.
+    #
+    # The result object is shared by all waiters: only decorate functions
+    # whose results are immutable (Rows, cached dicts), never ORM instances,
+    # and only pure reads. Callers must key on anything that decides
+    # freshness (e.g. the table version behind an ETag): a flight started
+    # before a commit returns pre-commit data to everyone who joins it. An
+    # exception reaches every waiter. A cancelled leader still waits for its
+    # task, which runs on the leader's session, so the session is not closed
+    # under it; followers get the result. Cancelling a follower does not
+    # affect the others.
+    signature = inspect.signature(fn)
+    inflight: dict[Hashable, asyncio.Task] = {}
+
+    @functools.wraps(fn)
+    async def wrapper(db, *args: Any, **kwargs: Any) -> T:
+        if not settings.singleflight_enabled:
+            return await fn(db, *args, **kwargs)
+        bound = signature.bind(db, *args, **kwargs)
+        bound.apply_defaults()
+        params = tuple(bound.arguments.items())[1:]
+        key = (db.get_bind(), params)
+        try:
+            hash(key)
+        except TypeError:
+            return await fn(db, *args, **kwargs)
+
+        while True:
+            task = inflight.get(key)
+            if task is None:
+                task = asyncio.get_running_loop().create_task(fn(db, *args, **kwargs))
+                inflight[key] = task
+                task.add_done_callback(
+                    lambda t, k=key: inflight.pop(k, None) if inflight.get(k) is t else None
+                )
+                task.add_done_callback(_retrieve)
+                wrapper.leaders += 1
+                try:
+                    await asyncio.wait((task,))
+                except asyncio.CancelledError:
+                    # Hold the session until the query is done, then re-raise.
+                    while not task.done():
+                        try:
+                            await asyncio.wait((task,))
+                        except asyncio.CancelledError:
+                            pass
+                    raise
+                return task.result()
+
+            wrapper.followers += 1
+            # asyncio.wait does not cancel the task if this waiter is cancelled.
+            await asyncio.wait((task,))
+            if task.cancelled():
+                continue  # cancelled from outside (e.g. shutdown); start over
+            return task.result()
+
+    wrapper.leaders = 0
+    wrapper.followers = 0
+    wrapper.inflight = inflight
+    return wrapper
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import mimetypes
+import os
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from app.core.compression import accepted_encodings
+
+_VARIANTS = (("br", ".br"), ("gzip", ".gz"))
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    # Serves the built frontend. For foo.js, a sibling foo.js.br / foo.js.gz
+    # (scripts/precompress_static.py) is sent instead when the client accepts
+    # it, so static content costs no CPU per request. Vite's hashed files
+    # under assets/ are cached forever; everything else (index.html) is
+    # revalidated. Unknown extensionless paths fall back to index.html for
+    # client-side routing.
+
+    def __init__(self, *, directory: str, **kwargs):
+        super().__init__(directory=directory, html=True, **kwargs)
+        self._root = os.path.realpath(directory)
+        # The bundle is immutable for the life of the process: index the
+        # variants once instead of stat()ing on every request.
+        self._variants: dict[str, os.stat_result] = {}
+        for base, _, files in os.walk(self._root):
+            for name in files:
+                if name.endswith((".br", ".gz")):
+                    path = os.path.join(base, name)
+                    self._variants[path] = os.stat(path)
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        try:
+            return await super().get_response(path, scope)
+        except HTTPException as exc:
+            leaf = path.rsplit("/", 1)[-1]
+            if exc.status_code != 404 or "." in leaf or path.startswith("api/"):
+                raise
+            return await super().get_response("index.html", scope)
+
+    def file_response(self, full_path, stat_result, scope: Scope, status_code: int = 200) -> Response:
+        full_path = os.path.realpath(full_path)
+        relative = os.path.relpath(full_path, self._root)
+        headers = {
+            "Cache-Control": IMMUTABLE if relative.startswith("assets" + os.sep) else "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+        request_headers = Headers(scope=scope)
+        accepted = accepted_encodings(request_headers)
+        response: Response | None = None
+        for encoding, suffix in _VARIANTS:
+            variant = self._variants.get(full_path + suffix)
+            if variant is not None and accepted.get(encoding, 0.0) > 0:
+                headers["Content-Encoding"] = encoding
+                response = FileResponse(
+                    full_path + suffix,
+                    status_code=status_code,
+                    headers=headers,
+                    media_type=mimetypes.guess_type(full_path)[0] or "application/octet-stream",
+                    stat_result=variant,
+                )
+                break
+        if response is None:
+            response = FileResponse(full_path, status_code=status_code, headers=headers, stat_result=stat_result)
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+import orjson
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger("app.timing")
+
+
+class RequestTiming:
+    __slots__ = ("start", "db_count", "db_time", "spans")
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.db_count = 0
+        self.db_time = 0.0
+        self.spans: dict[str, float] = {}
+
+    def server_timing(self, now: float) -> str:
+        parts = [f"app;dur={(now - self.start) * 1000:.2f}"]
+        parts.append(f'db;dur={self.db_time * 1000:.2f};desc="{self.db_count} queries"')
+        parts.extend(f"{name};dur={dur * 1000:.2f}" for name, dur in self.spans.items())
+        return ", ".join(parts)
+
+
+# Set only for sampled requests; everything below is a no-op otherwise.
+# SQLAlchemy runs engine events in a greenlet that shares the caller's
+# context, so the hooks see the request's RequestTiming.
+_current: ContextVar[RequestTiming | None] = ContextVar("request_timing", default=None)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.spans[name] = timing.spans.get(name, 0.0) + time.perf_counter() - start
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None:
+        context._timing_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    timing = _current.get()
+    start = getattr(context, "_timing_start", None)
+    if timing is not None and start is not None:
+        timing.db_count += 1
+        timing.db_time += time.perf_counter() - start
+
+
+def instrument_engine(engine: Engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class TimingMiddleware:
+    # Pure ASGI (works with streamed bodies). For a sampled fraction of
+    # requests: Server-Timing header (app, db, auth, ser) on the response and
+    # one JSON log line on completion.
+
+    def __init__(self, app: ASGIApp, *, sample_rate: float = 1.0) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        token = _current.set(timing)
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", timing.server_timing(time.perf_counter()))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            logger.info(orjson.dumps({
+                "event": "request",
+                "method": scope["method"],
+                "route": getattr(route, "path", scope["path"]),
+                "status": status_code,
+                "total_ms": round((time.perf_counter() - timing.start) * 1000, 3),
+                "db_queries": timing.db_count,
+                "db_ms": round(timing.db_time * 1000, 3),
+                **{f"{k}_ms": round(v * 1000, 3) for k, v in timing.spans.items()},
+            }).decode())
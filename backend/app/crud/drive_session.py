@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Sequence
+
+from sqlalchemy import Row, bindparam, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.student import STUDENTS_VERSION
+from app.crud.version import commit_write
+from app.models.drive_session import DriveSession
+from app.models.student import Student
+
+SESSION_COLUMNS = (
+    DriveSession.id,
+    DriveSession.student_id,
+    DriveSession.instructor_id,
+    DriveSession.started_at,
+    DriveSession.duration_minutes,
+)
+
+# executemany: one parameter set per student, applied as an increment so
+# concurrent ingests cannot lose each other's hours.
+_ADD_HOURS = (
+    update(Student.__table__)
+    .where(Student.id == bindparam("sid"))
+    .values(progress_hours=Student.progress_hours + bindparam("delta"))
+)
+
+
+async def ingest_sessions(db: AsyncSession, rows: list[dict], *, batch_size: int = 1000) -> list[int]:
+    # Log the sessions and add their hours to each student's progress_hours
+    # in the same transaction. Unknown student/instructor ids raise
+    # IntegrityError (foreign keys); nothing is written then.
+    for start in range(0, len(rows), batch_size):
+        await db.execute(insert(DriveSession.__table__), rows[start:start + batch_size])
+
+    minutes: dict[int, int] = defaultdict(int)
+    for r in rows:
+        minutes[r["student_id"]] += r["duration_minutes"]
+    # Ascending id order, so concurrent ingests lock students in the same order.
+    student_ids = sorted(minutes)
+    await db.execute(_ADD_HOURS, [{"sid": sid, "delta": minutes[sid] / 60} for sid in student_ids])
+    await commit_write(db, STUDENTS_VERSION, "update", student_ids)
+    return student_ids
+
+
+async def list_student_sessions(
+    db: AsyncSession, student_id: int, *, start: datetime, end: datetime, limit: int = 500,
+) -> Sequence[Row]:
+    # The started_at bounds let Postgres prune to the months in range; the
+    # (student_id, started_at) index does the rest.
+    stmt = (
+        select(*SESSION_COLUMNS)
+        .where(
+            DriveSession.student_id == student_id,
+            DriveSession.started_at >= start,
+            DriveSession.started_at < end,
+        )
+        .order_by(DriveSession.started_at.desc(), DriveSession.id.desc())
+        .limit(limit)
+    )
+    return (await db.execute(stmt)).all()
@@ -1,47 +1,287 @@
 from __future__ import annotations
 
-from sqlalchemy import select, func
+from typing import Any, AsyncIterator, Sequence
+
+from sqlalchemy import ColumnElement, Integer, Row, Select, any_, bindparam, case, delete, insert, literal, select, func, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.events import STUDENTS_CHANNEL
+from app.core.singleflight import singleflight
+from app.crud.version import commit_write, get_version, register_table
 from app.models.student import Student
+from app.models.student_status_count import StudentStatusCount
 from app.models.enums import StudentStatus
-from app.schemas.student import StudentCreate, StudentUpdate
+from app.schemas.student import StudentCreate, StudentFilters, StudentUpdate
+
+
+STUDENTS_VERSION = "students"
+
+# Per-worker, keyed by the students table version when the caller has it, so
+# a write in any worker invalidates every worker's entry.
+_stats_cache: TTLCache[int | None, dict[str, int]] = TTLCache(maxsize=4, ttl=settings.dashboard_stats_ttl_seconds)
+
+register_table(STUDENTS_VERSION, channel=STUDENTS_CHANNEL, invalidate=_stats_cache.clear)
+
+EXPORT_COLUMNS = tuple(c.name for c in Student.__table__.c)
+
+SORT_COLUMNS = {
+    "id": Student.id,
+    "name": Student.name,
+    "status": Student.status,
+    "progress_hours": Student.progress_hours,
+}
+
+
+async def students_version(db: AsyncSession) -> int | None:
+    return await get_version(db, STUDENTS_VERSION)
+
 
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
-async def list_students(db: AsyncSession, *, limit: int = 200, offset: int = 0) -> list[Student]:
-    res = await db.execute(select(Student).order_by(Student.id.desc()).limit(limit).offset(offset))
+
+def _apply_filters(stmt: Select, filters: StudentFilters | None) -> Select:
+    if filters is None:
+        return stmt
+    if filters.status is not None:
+        stmt = stmt.where(Student.status == filters.status)
+    if filters.min_hours is not None:
+        stmt = stmt.where(Student.progress_hours >= filters.min_hours)
+    if filters.max_hours is not None:
+        stmt = stmt.where(Student.progress_hours <= filters.max_hours)
+    if filters.q:
+        # Substring match; served by the pg_trgm GIN index (migration 0003).
+        stmt = stmt.where(Student.name.ilike(f"%{_escape_like(filters.q)}%", escape="\\"))
+    return stmt
+
+
+STUDENT_COLUMNS = tuple(Student.__table__.c)
+
+
+def _list_stmt(
+    stmt: Select,
+    *,
+    limit: int,
+    offset: int,
+    filters: StudentFilters | None,
+    sort: str,
+    descending: bool,
+    after: tuple[Any, int] | None,
+) -> Select:
+    # Ordered by (sort column, id) so the order is total. `after` is the
+    # (sort value, id) of the previous page's last row and seeks past it
+    # instead of scanning and discarding `offset` rows.
+    col = SORT_COLUMNS[sort]
+    stmt = _apply_filters(stmt, filters)
+    if sort == "id":
+        stmt = stmt.order_by(Student.id.desc() if descending else Student.id.asc())
+    else:
+        stmt = stmt.order_by(*((col.desc(), Student.id.desc()) if descending else (col.asc(), Student.id.asc())))
+    if after is not None:
+        key = Student.id if sort == "id" else tuple_(col, Student.id)
+        # Each element is bound with its column's type, so e.g. a status key
+        # compares as student_status_enum rather than varchar.
+        bound = after[1] if sort == "id" else tuple_(literal(after[0], col.type), literal(after[1], Student.id.type))
+        stmt = stmt.where(key < bound if descending else key > bound)
+    stmt = stmt.limit(limit)
+    if offset:
+        stmt = stmt.offset(offset)
+    return stmt
+
+
+async def list_students(
+    db: AsyncSession,
+    *,
+    limit: int = 200,
+    offset: int = 0,
+    filters: StudentFilters | None = None,
+    sort: str = "id",
+    descending: bool = True,
+    after: tuple[Any, int] | None = None,
+) -> list[Student]:
+    stmt = _list_stmt(
+        select(Student),
+        limit=limit, offset=offset, filters=filters, sort=sort, descending=descending, after=after,
+    )
+    res = await db.execute(stmt)
     return list(res.scalars().all())
 
 
+async def list_student_rows(
+    db: AsyncSession,
+    *,
+    limit: int = 200,
+    offset: int = 0,
+    filters: StudentFilters | None = None,
+    sort: str = "id",
+    descending: bool = True,
+    after: tuple[Any, int] | None = None,
+) -> Sequence[Row]:
+    # Same query as list_students but plain column rows: no ORM instances,
+    # instance state or identity map. Used by the JSON fast path.
+    stmt = _list_stmt(
+        select(*STUDENT_COLUMNS),
+        limit=limit, offset=offset, filters=filters, sort=sort, descending=descending, after=after,
+    )
+    res = await db.execute(stmt)
+    return res.all()
+
+
+async def stream_students(
+    db: AsyncSession,
+    *,
+    filters: StudentFilters | None = None,
+    batch_size: int = 1000,
+) -> AsyncIterator[Sequence[Row]]:
+    # Plain column rows from a server-side cursor, `batch_size` at a time;
+    # no ORM objects or identity map, so memory is independent of table size.
+    stmt = _apply_filters(select(*STUDENT_COLUMNS), filters).order_by(Student.id)
+    result = await db.stream(stmt.execution_options(yield_per=batch_size))
+    async for partition in result.partitions():
+        yield partition
+
+
 async def get_student(db: AsyncSession, student_id: int) -> Student | None:
     res = await db.execute(select(Student).where(Student.id == student_id))
     return res.scalar_one_or_none()
 
 
-async def create_student(db: AsyncSession, data: StudentCreate) -> Student:
-    st = Student(**data.model_dump())
-    db.add(st)
-    await db.commit()
-    await db.refresh(st)
-    return st
+async def get_student_row(db: AsyncSession, student_id: int, *, version: int | None = None) -> Row | None:
+    # Concurrent readers that saw the same students version share one query;
+    # without a version (no ETag, or inside a write) always query directly.
+    if version is None:
+        return await _fetch_student_row(db, student_id)
+    return await _shared_student_row(db, student_id, version)
+
+
+async def _fetch_student_row(db: AsyncSession, student_id: int) -> Row | None:
+    res = await db.execute(select(*STUDENT_COLUMNS).where(Student.id == student_id))
+    return res.one_or_none()
+
+
+@singleflight
+async def _shared_student_row(db: AsyncSession, student_id: int, version: int) -> Row | None:
+    # version is only part of the coalescing key: a flight keyed on the
+    # version this reader saw started after that commit.
+    return await _fetch_student_row(db, student_id)
 
 
-async def update_student(db: AsyncSession, student: Student, data: StudentUpdate) -> Student:
+async def create_student(db: AsyncSession, data: StudentCreate) -> Row:
+    stmt = insert(Student.__table__).values(**data.model_dump()).returning(*STUDENT_COLUMNS)
+    row = (await db.execute(stmt)).one()
+    await commit_write(db, STUDENTS_VERSION, "create", [row.id])
+    return row
+
+
+async def bulk_create_students(db: AsyncSession, rows: list[dict], *, batch_size: int = 1000) -> list[int]:
+    # Multi-row INSERT ... RETURNING id per batch, one transaction for all.
+    ids: list[int] = []
+    stmt = insert(Student).returning(Student.id, sort_by_parameter_order=True)
+    for start in range(0, len(rows), batch_size):
+        res = await db.execute(stmt, rows[start:start + batch_size])
+        ids.extend(res.scalars().all())
+    await commit_write(db, STUDENTS_VERSION, "create", ids)
+    return ids
+
+
+# Single-row writes are one statement with RETURNING: no prior SELECT to
+# check existence, no refresh after the commit. None/False means no such id.
+async def update_student(db: AsyncSession, student_id: int, data: StudentUpdate) -> Row | None:
     payload = data.model_dump(exclude_unset=True)
-    for k, v in payload.items():
-        setattr(student, k, v)
-    await db.commit()
-    await db.refresh(student)
-    return student
+    if not payload:
+        return await get_student_row(db, student_id)
+    stmt = (
+        update(Student.__table__)
+        .where(Student.id == student_id)
+        .values(**payload)
+        .returning(*STUDENT_COLUMNS)
+    )
+    row = (await db.execute(stmt)).one_or_none()
+    if row is None:
+        await db.rollback()
+        return None
+    await commit_write(db, STUDENTS_VERSION, "update", [row.id])
+    return row
+
+
+async def delete_student(db: AsyncSession, student_id: int) -> bool:
+    stmt = delete(Student.__table__).where(Student.id == student_id).returning(Student.id)
+    if (await db.execute(stmt)).scalar_one_or_none() is None:
+        await db.rollback()
+        return False
+    await commit_write(db, STUDENTS_VERSION, "delete", [student_id])
+    return True
+
+
+def _id_in(db: AsyncSession, ids: list[int]) -> ColumnElement[bool]:
+    # Postgres: one `id = ANY(:ids)` statement regardless of batch size, so the
+    # prepared statement is reused. Elsewhere fall back to an expanding IN.
+    if db.get_bind().dialect.name == "postgresql":
+        return Student.id == any_(bindparam("ids", ids, type_=ARRAY(Integer)))
+    return Student.id.in_(ids)
+
+
+async def _commit_batch(db: AsyncSession, op: str, ids: list[int]) -> None:
+    # A batch that matched no rows changed nothing: end the transaction
+    # without bumping the version (which would invalidate every ETag and the
+    # stats cache) or notifying.
+    if ids:
+        await commit_write(db, STUDENTS_VERSION, op, ids)
+    else:
+        await db.rollback()
+
+
+async def batch_update_status(db: AsyncSession, ids: list[int], status: StudentStatus) -> Sequence[Row]:
+    stmt = (
+        update(Student.__table__)
+        .where(_id_in(db, ids))
+        .values(status=status)
+        .returning(*STUDENT_COLUMNS)
+    )
+    rows = (await db.execute(stmt)).all()
+    await _commit_batch(db, "update", [r.id for r in rows])
+    return rows
+
+
+async def batch_add_progress(db: AsyncSession, ids: list[int], delta_hours: float) -> Sequence[Row]:
+    # Increment in SQL so concurrent loggers cannot lose each other's hours;
+    # negative corrections clamp at zero.
+    new_value = Student.progress_hours + delta_hours
+    stmt = (
+        update(Student.__table__)
+        .where(_id_in(db, ids))
+        .values(progress_hours=case((new_value < 0, 0.0), else_=new_value))
+        .returning(*STUDENT_COLUMNS)
+    )
+    rows = (await db.execute(stmt)).all()
+    await _commit_batch(db, "update", [r.id for r in rows])
+    return rows
 
 
-async def delete_student(db: AsyncSession, student: Student) -> None:
-    await db.delete(student)
-    await db.commit()
+async def batch_delete(db: AsyncSession, ids: list[int]) -> list[int]:
+    stmt = delete(Student.__table__).where(_id_in(db, ids)).returning(Student.id)
+    deleted = list((await db.execute(stmt)).scalars().all())
+    await _commit_batch(db, "delete", deleted)
+    return deleted
 
 
-async def dashboard_stats(db: AsyncSession) -> dict[str, int]:
-    total = (await db.execute(select(func.count(Student.id)))).scalar_one()
-    active = (await db.execute(select(func.count(Student.id)).where(Student.status == StudentStatus.active))).scalar_one()
-    completed = (await db.execute(select(func.count(Student.id)).where(Student.status == StudentStatus.completed))).scalar_one()
-    return {"total": int(total), "active": int(active), "completed": int(completed)}
+@singleflight
+async def dashboard_stats(db: AsyncSession, *, version: int | None = None) -> dict[str, int]:
+    cached = _stats_cache.get(version)
+    if cached is not None:
+        return cached
+    if settings.dashboard_stats_source == "summary":
+        stmt = select(StudentStatusCount.status, StudentStatusCount.count)
+    else:
+        stmt = select(Student.status, func.count()).group_by(Student.status)
+    counts = {st: int(n) for st, n in (await db.execute(stmt)).all()}
+    data = {
+        "total": sum(counts.values()),
+        "active": counts.get(StudentStatus.active, 0),
+        "completed": counts.get(StudentStatus.completed, 0),
+    }
+    _stats_cache.set(version, data)
+    return data
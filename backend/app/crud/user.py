@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+from sqlalchemy import Row, delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
 from app.models.enums import Role
-from app.core.security import hash_password
+from app.core.security import hash_password_async
 
 
 async def get_by_username(db: AsyncSession, username: str) -> User | None:
@@ -23,21 +24,43 @@ async def list_users(db: AsyncSession) -> list[User]:
     return list(res.scalars().all())
 
 
-async def create_user(db: AsyncSession, *, username: str, password: str, role: Role) -> User:
-    user = User(username=username, hashed_password=hash_password(password), role=role)
-    db.add(user)
-    await db.commit()
-    await db.refresh(user)
-    return user
+# Writes are one statement with RETURNING and one commit; the returned row
+# carries the username so callers can invalidate cached principals.
+USER_COLUMNS = (User.id, User.username, User.role)
+
+
+async def create_user(db: AsyncSession, *, username: str, password: str, role: Role) -> Row | None:
+    # None if the username is taken. Checked before hashing, so duplicates
+    # never occupy the bounded hash pool; the unique constraint still
+    # catches a concurrent create of the same name.
+    taken = (await db.execute(select(User.id).where(User.username == username))).first()
+    # End the read so no pooled connection is held during the hash.
+    await db.rollback()
+    if taken is not None:
+        return None
+    stmt = (
+        insert(User.__table__)
+        .values(username=username, hashed_password=await hash_password_async(password), role=role)
+        .returning(*USER_COLUMNS)
+    )
+    try:
+        row = (await db.execute(stmt)).one()
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        return None
+    return row
 
 
-async def update_user_role(db: AsyncSession, user: User, role: Role) -> User:
-    user.role = role
+async def update_user_role(db: AsyncSession, user_id: int, role: Role) -> Row | None:
+    stmt = update(User.__table__).where(User.id == user_id).values(role=role).returning(*USER_COLUMNS)
+    row = (await db.execute(stmt)).one_or_none()
     await db.commit()
-    await db.refresh(user)
-    return user
+    return row
 
 
-async def delete_user(db: AsyncSession, user: User) -> None:
-    await db.delete(user)
+async def delete_user(db: AsyncSession, user_id: int) -> str | None:
+    stmt = delete(User.__table__).where(User.id == user_id).returning(User.username)
+    username = (await db.execute(stmt)).scalar_one_or_none()
     await db.commit()
+    return username
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import Callable
+
+from sqlalchemy import select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.events import change_payload
+from app.models.table_version import TableVersion
+
+# Per versioned table, registered by the crud module that owns it: the NOTIFY
+# channel for its changes and this worker's caches to drop after a write.
+_channels: dict[str, str] = {}
+_invalidators: dict[str, list[Callable[[], None]]] = {}
+
+
+def register_table(
+    name: str, *, channel: str | None = None, invalidate: Callable[[], None] | None = None,
+) -> None:
+    if channel is not None:
+        _channels[name] = channel
+    if invalidate is not None:
+        _invalidators.setdefault(name, []).append(invalidate)
+
+
+# None when the table has no counter row (e.g. an unmigrated dev database);
+# callers must then skip conditional responses rather than use a constant.
+async def get_version(db: AsyncSession, name: str) -> int | None:
+    res = await db.execute(select(TableVersion.version).where(TableVersion.name == name))
+    return res.scalar_one_or_none()
+
+
+async def bump_version(db: AsyncSession, name: str) -> None:
+    await db.execute(
+        update(TableVersion.__table__)
+        .where(TableVersion.name == name)
+        .values(version=TableVersion.version + 1)
+    )
+
+
+async def commit_write(db: AsyncSession, name: str, op: str, ids: list[int] | None) -> None:
+    # Every mutation of a versioned table goes through here: bump its change
+    # counter and (on Postgres) queue a NOTIFY in the same transaction, so
+    # both take effect exactly when the write commits; then drop this
+    # worker's cached derived data.
+    await bump_version(db, name)
+    channel = _channels.get(name)
+    if channel is not None and db.get_bind().dialect.name == "postgresql":
+        await db.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": channel, "payload": change_payload(op, ids)},
+        )
+    await db.commit()
+    for invalidate in _invalidators.get(name, ()):
+        invalidate()
@@ -1,11 +1,21 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 import re
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy.pool import NullPool
+import time
+from typing import Sequence
 
+from sqlalchemy import Executable, event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.metrics import DB_POOL_ACQUIRE
+
+logger = logging.getLogger(__name__)
 
 
 def _to_async_db_url(url: str) -> str:
@@ -19,21 +29,197 @@ def _to_async_db_url(url: str) -> str:
     return url
 
 
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    # Records how long checkouts wait (queueing + connect) and logs slow ones.
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.acquire_count = 0
+        self.acquire_wait_total = 0.0
+        self.acquire_wait_max = 0.0
+        self.slow_acquires = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - start
+            DB_POOL_ACQUIRE.observe(waited)
+            self.acquire_count += 1
+            self.acquire_wait_total += waited
+            if waited > self.acquire_wait_max:
+                self.acquire_wait_max = waited
+            if waited * 1000 >= settings.db_slow_acquire_ms:
+                self.slow_acquires += 1
+                logger.warning(
+                    "slow db connection acquire: %.1f ms (checked out %d, overflow %d)",
+                    waited * 1000, self.checkedout(), self.overflow(),
+                )
+
+
+def _engine_kwargs(url: str) -> dict:
+    kwargs: dict = {"echo": False}
+    if settings.env == "dev":
+        kwargs["poolclass"] = NullPool
+    elif not url.startswith("sqlite"):
+        kwargs.update(
+            poolclass=TimedQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=settings.db_pool_pre_ping,
+        )
+    if url.startswith("postgresql+asyncpg"):
+        connect_args: dict = {"statement_cache_size": settings.db_statement_cache_size}
+        if settings.db_statement_timeout_ms:
+            connect_args["server_settings"] = {"statement_timeout": str(settings.db_statement_timeout_ms)}
+        kwargs["connect_args"] = connect_args
+    return kwargs
+
+
+def pool_status(engine: AsyncEngine) -> dict:
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, AsyncAdaptedQueuePool):
+        return {"pool": type(pool).__name__}
+    data = {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": settings.db_max_overflow,
+    }
+    if isinstance(pool, TimedQueuePool):
+        data.update(
+            acquires=pool.acquire_count,
+            slow_acquires=pool.slow_acquires,
+            acquire_wait_avg_ms=round(pool.acquire_wait_total / pool.acquire_count * 1000, 3) if pool.acquire_count else 0.0,
+            acquire_wait_max_ms=round(pool.acquire_wait_max * 1000, 3),
+        )
+    return data
+
+
+async def prewarm_pool(engine: AsyncEngine, count: int, statements: Sequence[Executable] = ()) -> int:
+    # Open up to `count` pooled connections at once (all held until every one
+    # is open, so they are distinct) and run `statements` on each: connect,
+    # asyncpg type introspection and statement preparation then happen here
+    # rather than in the first requests. Returns the connections opened.
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, AsyncAdaptedQueuePool) or count <= 0:
+        return 0
+    count = min(count, pool.size())
+    arrived = 0
+    all_open = asyncio.Event()
+    opened = 0
+
+    def _arrive() -> None:
+        nonlocal arrived
+        arrived += 1
+        if arrived == count:
+            all_open.set()
+
+    async def _one() -> None:
+        nonlocal opened
+        try:
+            async with engine.connect() as conn:
+                opened += 1
+                _arrive()
+                for stmt in statements or (text("SELECT 1"),):
+                    try:
+                        await conn.execute(stmt)
+                    except Exception as exc:
+                        logger.warning("prewarm statement failed: %s", exc)
+                        await conn.rollback()
+                await all_open.wait()
+        except Exception:
+            _arrive()
+            raise
+
+    results = await asyncio.gather(*(_one() for _ in range(count)), return_exceptions=True)
+    for exc in {type(r).__name__: r for r in results if isinstance(r, BaseException)}.values():
+        logger.warning("prewarm connection failed: %s", exc)
+    return opened
+
+
 ASYNC_DATABASE_URL = _to_async_db_url(settings.database_url)
 
-engine = create_async_engine(
-    ASYNC_DATABASE_URL,
-    echo=False,
-    poolclass=NullPool if settings.env == "dev" else None,
-)
+engine = create_async_engine(ASYNC_DATABASE_URL, **_engine_kwargs(ASYNC_DATABASE_URL))
+
+if settings.database_read_url:
+    ASYNC_READ_DATABASE_URL = _to_async_db_url(settings.database_read_url)
+    read_engine = create_async_engine(ASYNC_READ_DATABASE_URL, **_engine_kwargs(ASYNC_READ_DATABASE_URL))
+else:
+    read_engine = engine
+
+class ReleasingSession(AsyncSession):
+    # For read-only work on an AUTOCOMMIT bind: a pooled connection is checked
+    # out on the first statement and handed back as soon as its (buffered)
+    # result is in hand, instead of being held until the request finishes.
+    # Each statement sees its own snapshot. Not for stream(), which needs the
+    # connection while iterating.
+
+    async def _release(self) -> None:
+        if self.in_transaction() and not (self.new or self.dirty or self.deleted):
+            await self.commit()
+
+    async def execute(self, *args, **kwargs):
+        result = await super().execute(*args, **kwargs)
+        await self._release()
+        return result
+
+    async def scalar(self, *args, **kwargs):
+        value = await super().scalar(*args, **kwargs)
+        await self._release()
+        return value
+
+    async def get(self, *args, **kwargs):
+        obj = await super().get(*args, **kwargs)
+        await self._release()
+        return obj
+
 
 AsyncSessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+# Transactional replica session (server-side cursors need a transaction).
+AsyncReadSessionLocal = async_sessionmaker(bind=read_engine, class_=AsyncSession, expire_on_commit=False)
+# Per-statement read sessions. With AUTOCOMMIT the "commit" that releases the
+# connection is not a server round trip.
+autocommit_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+PrimaryReadSessionLocal = async_sessionmaker(
+    bind=autocommit_engine, class_=ReleasingSession, expire_on_commit=False,
+)
+ReplicaReadSessionLocal = async_sessionmaker(
+    bind=read_engine.execution_options(isolation_level="AUTOCOMMIT"), class_=ReleasingSession, expire_on_commit=False,
+)
 
 
 class Base(DeclarativeBase):
     pass
 
 
+# Read-your-writes: principals that recently committed on the primary keep
+# reading from it until the replica has (very likely) caught up. Per worker.
+_primary_pins: TTLCache[str, bool] = TTLCache(maxsize=10_000, ttl=settings.read_your_writes_seconds)
+
+
+def pin_to_primary(principal: str) -> None:
+    _primary_pins.set(principal, True)
+
+
+def is_pinned_to_primary(principal: str) -> bool:
+    return _primary_pins.get(principal) is not None
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_committed(session: Session) -> None:
+    session.info["committed"] = True
+
+
 async def get_db() -> AsyncSession:
     async with AsyncSessionLocal() as session:
         yield session
+        # get_current_user tags the request session with its principal.
+        principal = session.info.get("principal")
+        if principal and session.info.get("committed") and read_engine is not engine:
+            pin_to_primary(principal)
@@ -1,35 +1,135 @@
 from __future__ import annotations
 
+import hmac
+import time
+from dataclasses import dataclass
+from typing import Any
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import decode_token, verify_password
-from app.db.database import get_db
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import decode_token
+from app.core.timing import span
+from app.db.database import PrimaryReadSessionLocal, get_db
 from app.crud.user import get_by_username
 from app.models.enums import Role
-from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
-async def get_current_user(db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
+@dataclass(frozen=True, slots=True)
+class Principal:
+    id: int
+    username: str
+    role: Role
+
+
+# Keyed by token subject (username). Invalidate on role change / delete.
+principal_cache: TTLCache[str, Principal] = TTLCache(
+    maxsize=settings.principal_cache_max_size,
+    ttl=settings.principal_cache_ttl_seconds,
+)
+
+
+# username -> time of the last role change/delete seen by this worker. Tokens
+# issued before it are not trusted for claims-only auth. Entries only need to
+# outlive the tokens they reject.
+_revoked_before: TTLCache[str, float] = TTLCache(
+    maxsize=settings.principal_cache_max_size,
+    ttl=settings.access_token_expire_minutes * 60,
+)
+
+
+def invalidate_principal(username: str) -> None:
+    principal_cache.pop(username)
+    _revoked_before.set(username, time.time())
+
+
+async def get_current_user(db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme)) -> Principal:
+    with span("auth"):
+        payload = _decode(token)
+        db.info["principal"] = payload["sub"]
+        return await _resolve_principal(payload)
+
+
+# For read-only routes: no request session, and with AUTH_TRUST_CLAIMS no user
+# lookup either while the token's claims are fresh enough to trust.
+async def get_token_principal(token: str = Depends(oauth2_scheme)) -> Principal:
+    with span("auth"):
+        payload = _decode(token)
+        principal = _claims_principal(payload)
+        if principal is not None:
+            return principal
+        return await _resolve_principal(payload)
+
+
+def _decode(token: str) -> dict[str, Any]:
     try:
         payload = decode_token(token)
-        username = payload.get("sub")
-        if not username:
+        if not payload.get("sub"):
             raise ValueError("missing sub")
     except Exception:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication token")
+    return payload
+
+
+def _claims_principal(payload: dict[str, Any]) -> Principal | None:
+    if not settings.auth_trust_claims:
+        return None
+    issued_at, user_id = payload.get("iat"), payload.get("uid")
+    if not isinstance(issued_at, (int, float)) or not isinstance(user_id, int):
+        return None
+    if time.time() - issued_at > settings.auth_claims_max_age_seconds:
+        return None
+    username = payload["sub"]
+    revoked = _revoked_before.get(username)
+    if revoked is not None and issued_at <= revoked:
+        return None
+    try:
+        role = Role(payload.get("role"))
+    except ValueError:
+        return None
+    return Principal(id=user_id, username=username, role=role)
 
-    user = await get_by_username(db, username)
+
+async def _resolve_principal(payload: dict[str, Any]) -> Principal:
+    username = payload["sub"]
+    principal = principal_cache.get(username)
+    if principal is not None:
+        return principal
+
+    # Look up on a per-statement session so the request's own session (and a
+    # pooled connection) is only checked out if the handler actually uses it.
+    async with PrimaryReadSessionLocal() as lookup:
+        user = await get_by_username(lookup, username)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    return user
+    principal = Principal(id=user.id, username=user.username, role=user.role)
+    principal_cache.set(username, principal)
+    return principal
+
+
+# Monitoring endpoints: MONITORING_TOKEN as the bearer token (scrapers and
+# probes cannot log in), or an admin's own token.
+async def require_monitoring(token: str = Depends(oauth2_scheme)) -> None:
+    expected = settings.monitoring_token
+    if expected and hmac.compare_digest(token.encode(), expected.encode()):
+        return
+    # Admin access: resolved from the user table, not trusted claims.
+    user = await _resolve_principal(_decode(token))
+    if user.role is not Role.admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
+
 
+def require_role(*roles: Role, from_claims: bool = False):
+    # from_claims: resolve via get_token_principal (non-privileged read-only
+    # routes only; never for admin-gated ones).
+    resolver = get_token_principal if from_claims else get_current_user
 
-def require_role(*roles: Role):
-    async def _dep(user: User = Depends(get_current_user)) -> User:
+    async def _dep(user: Principal = Depends(resolver)) -> Principal:
         if user.role not in roles:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
         return user
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db.database import (
+    AsyncReadSessionLocal,
+    AsyncSessionLocal,
+    PrimaryReadSessionLocal,
+    ReplicaReadSessionLocal,
+    is_pinned_to_primary,
+)
+from app.dependencies.auth import Principal, get_token_principal
+
+
+# Session for read-only endpoints: the replica when DATABASE_READ_URL is set,
+# unless this principal wrote recently (then the primary). Connections are
+# held per statement, not for the whole request. Pair with
+# require_role(..., from_claims=True) so the principal is resolved once.
+async def get_read_db(user: Principal = Depends(get_token_principal)) -> AsyncSession:
+    factory = PrimaryReadSessionLocal if is_pinned_to_primary(user.username) else ReplicaReadSessionLocal
+    async with factory() as session:
+        yield session
+
+
+# For streamed bodies, which open their own session after the request's
+# dependencies have closed: the same replica/primary routing as get_read_db,
+# as a transactional sessionmaker (server-side cursors need a transaction).
+async def get_read_sessionmaker(user: Principal = Depends(get_token_principal)) -> async_sessionmaker:
+    return AsyncSessionLocal if is_pinned_to_primary(user.username) else AsyncReadSessionLocal
+
+
+# Primary, per-statement: for unauthenticated reads such as the login lookup,
+# which should not hold a connection across the bcrypt check.
+async def get_primary_read_db() -> AsyncSession:
+    async with PrimaryReadSessionLocal() as session:
+        yield session
@@ -1,26 +1,83 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from fastapi.responses import ORJSONResponse
 from starlette.middleware.cors import CORSMiddleware
-from slowapi import _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
 
+from app.core.audit import audit_log
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
-from app.core.limiter import limiter
+from app.core.events import student_changes
+from app.core.metrics import MetricsMiddleware, instrument_pool, mark_process_dead
+from app.core.openapi import install_openapi, openapi_bytes
+from app.core.responses import TimedORJSONResponse
+from app.core.security import shutdown_password_hashing, warm_password_hashing
+from app.core.timing import TimingMiddleware, instrument_engine
+from app.db.database import engine, prewarm_pool, read_engine
 from app.api.router import api_router
 
+logger = logging.getLogger(__name__)
+
+
+async def prewarm(app: FastAPI) -> None:
+    # Pay connection setup, type introspection, bcrypt loading and OpenAPI
+    # generation before the worker takes traffic. Best effort and bounded.
+    from sqlalchemy import select
+
+    from app.crud.student import STUDENT_COLUMNS
+    from app.models.student import Student
+    from app.models.user import User
+
+    start = time.perf_counter()
+    openapi_bytes(app)
+    # The same SQL as the hottest reads, so asyncpg's statement cache is primed.
+    statements = [
+        select(User).where(User.username == ""),
+        select(*STUDENT_COLUMNS).where(Student.id == 0),
+    ]
+    n = settings.prewarm_db_connections
+    steps = [warm_password_hashing(), prewarm_pool(engine, n, statements)]
+    if read_engine is not engine:
+        steps.append(prewarm_pool(read_engine, n, statements))
+    try:
+        results = await asyncio.wait_for(
+            asyncio.gather(*steps, return_exceptions=True), settings.prewarm_timeout_seconds,
+        )
+    except asyncio.TimeoutError:
+        logger.warning("prewarm timed out after %.1fs", settings.prewarm_timeout_seconds)
+        return
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.warning("prewarm step failed: %r", result)
+    logger.info("prewarm finished in %.0f ms", (time.perf_counter() - start) * 1000)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.prewarm_enabled:
+        await prewarm(app)
+    audit_log.start()
+    yield
+    await audit_log.stop()
+    await student_changes.close()
+    shutdown_password_hashing()
+    mark_process_dead()
+
+
 def create_app() -> FastAPI:
     app = FastAPI(
         title="DriverEdOS API",
         version="1.0.0",
-        openapi_url="/openapi.json",
-        docs_url="/docs",
-        default_response_class=ORJSONResponse,
+        # Served from a per-process cache by install_openapi below.
+        openapi_url=None,
+        docs_url=None,
+        redoc_url=None,
+        default_response_class=TimedORJSONResponse,
+        lifespan=lifespan,
     )
 
-    # Rate limiting (optional, enabled by default with conservative limits)
-    app.state.limiter = limiter
-    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
     origins = settings.cors_origins_list
     app.add_middleware(
         CORSMiddleware,
@@ -30,7 +87,34 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    if settings.compression_enabled:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.compression_min_size,
+            gzip_level=settings.compression_gzip_level,
+            brotli_quality=settings.compression_brotli_quality,
+        )
+
+    # Opt-in request timing (Server-Timing + structured log), sampled.
+    if settings.timing_enabled:
+        instrument_engine(engine.sync_engine)
+        instrument_engine(read_engine.sync_engine)
+        app.add_middleware(TimingMiddleware, sample_rate=settings.timing_sample_rate)
+
+    if settings.metrics_enabled:
+        instrument_pool(engine, "primary")
+        if read_engine is not engine:
+            instrument_pool(read_engine, "replica")
+        app.add_middleware(MetricsMiddleware)
+
     app.include_router(api_router, prefix="/api")
+    install_openapi(app)
+
+    # After the API so /api/* always wins over the SPA fallback.
+    if settings.frontend_dist_dir:
+        from app.core.static import PrecompressedStaticFiles
+
+        app.mount("/", PrecompressedStaticFiles(directory=settings.frontend_dist_dir), name="frontend")
     return app
 
 app = create_app()
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, CheckConstraint, DateTime, ForeignKey, Index, Integer, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.database import Base
+
+
+# Append-only log of behind-the-wheel sessions; students.progress_hours is
+# maintained incrementally from it. Range-partitioned by month on Postgres
+# (migration 0006, scripts/manage_partitions.py), hence the composite key.
+class DriveSession(Base):
+    __tablename__ = "drive_sessions"
+    __table_args__ = (
+        CheckConstraint("duration_minutes > 0 AND duration_minutes <= 720", name="ck_drive_sessions_duration"),
+        Index("ix_drive_sessions_student_started", "student_id", "started_at"),
+        {"postgresql_partition_by": "RANGE (started_at)"},
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    student_id: Mapped[int] = mapped_column(ForeignKey("students.id", ondelete="CASCADE"), nullable=False)
+    instructor_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    duration_minutes: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import String, Float, Text, Enum as SAEnum
+from sqlalchemy import String, Float, Text, Enum as SAEnum, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.database import Base
@@ -9,6 +9,11 @@ from app.models.enums import StudentStatus
 
 class Student(Base):
     __tablename__ = "students"
+    __table_args__ = (
+        Index("ix_students_status_id", "status", "id"),
+        Index("ix_students_progress_hours_id", "progress_hours", "id"),
+        Index("ix_students_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(120), index=True, nullable=False)
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Enum as SAEnum
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.database import Base
+from app.models.enums import StudentStatus
+
+
+# One row per status, maintained by statement-level triggers on students
+# (see migration 0002). Read-only from the application.
+class StudentStatusCount(Base):
+    __tablename__ = "student_status_counts"
+
+    status: Mapped[StudentStatus] = mapped_column(SAEnum(StudentStatus, name="student_status_enum"), primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
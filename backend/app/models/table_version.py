@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.database import Base
+
+
+# Monotonic per-table change counters, bumped in the same transaction as each
+# write through crud. Used to answer conditional GETs without loading rows.
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from pydantic import AwareDatetime, BaseModel, Field
+
+class DriveSessionCreate(BaseModel):
+    student_id: int = Field(ge=1)
+    # Defaults to the authenticated user.
+    instructor_id: int | None = Field(default=None, ge=1)
+    started_at: AwareDatetime
+    duration_minutes: int = Field(gt=0, le=720)
+
+class DriveSessionOut(BaseModel):
+    id: int
+    student_id: int
+    instructor_id: int | None
+    started_at: datetime
+    duration_minutes: int
+
+class DriveSessionIngestResult(BaseModel):
+    inserted: int
+    student_ids: list[int]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from pydantic import BaseModel, Field
+from app.core.config import settings
 from app.models.enums import StudentStatus
 
 class StudentBase(BaseModel):
@@ -20,3 +21,34 @@ class StudentUpdate(BaseModel):
 
 class StudentOut(StudentBase):
     id: int
+
+class StudentFilters(BaseModel):
+    status: StudentStatus | None = None
+    min_hours: float | None = None
+    max_hours: float | None = None
+    q: str | None = None
+
+class StudentPage(BaseModel):
+    items: list[StudentOut]
+    next_cursor: str | None = None
+
+class StudentImportRowError(BaseModel):
+    row: int
+    errors: list[str]
+
+class StudentImportResult(BaseModel):
+    inserted: int
+    ids: list[int]
+    errors: list[StudentImportRowError]
+
+class StudentBatchIds(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=settings.students_batch_max_ids)
+
+class StudentBatchStatus(StudentBatchIds):
+    status: StudentStatus
+
+class StudentBatchProgress(StudentBatchIds):
+    delta_hours: float = Field(ge=-24.0, le=24.0)
+
+class StudentBatchDeleteResult(BaseModel):
+    deleted: list[int]
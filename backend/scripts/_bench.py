@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+# Shared helpers for the scripts/bench_*.py harnesses.
+# Run them from backend/ as modules, e.g. `python -m scripts.bench_login_storm`,
+# against a throwaway database (DATABASE_URL=sqlite+aiosqlite:///bench.db works).
+
+import time
+from contextlib import asynccontextmanager
+
+import httpx
+
+from app.core.security import hash_password
+from app.db.database import Base, engine, AsyncSessionLocal
+from app.models.enums import Role
+from app.models.user import User
+from app.models.student import Student  # noqa: F401  (register table)
+from app.models.audit_log import AuditEntry  # noqa: F401  (register table; app.core.audit imports it lazily)
+from sqlalchemy import select
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+def summarize(samples_s: list[float]) -> dict[str, float]:
+    ms = [s * 1000 for s in samples_s]
+    return {
+        "count": len(ms),
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "max_ms": round(max(ms) if ms else 0.0, 3),
+    }
+
+
+class Timer:
+    def __init__(self):
+        self.samples: list[float] = []
+
+    @asynccontextmanager
+    async def measure(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples.append(time.perf_counter() - start)
+
+
+async def prepare_schema() -> None:
+    # Range-partitioned tables (drive_sessions: composite key with an
+    # autoincrement id) cannot be created on SQLite and need their partitions
+    # from the migrations on Postgres; no harness uses them, so skip them.
+    async with engine.begin() as conn:
+        tables = [
+            t for t in Base.metadata.sorted_tables
+            if not t.dialect_options["postgresql"]["partition_by"]
+        ]
+        await conn.run_sync(Base.metadata.create_all, tables=tables)
+
+
+async def ensure_user(username: str, password: str, role: Role = Role.admin) -> None:
+    async with AsyncSessionLocal() as db:
+        res = await db.execute(select(User).where(User.username == username))
+        if res.scalar_one_or_none() is None:
+            db.add(User(username=username, hashed_password=hash_password(password), role=role))
+            await db.commit()
+
+
+@asynccontextmanager
+async def asgi_client(app):
+    # ASGITransport does not send lifespan events; run the app's lifespan
+    # here so background tasks (audit flusher) start and drain as in prod.
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            yield client
+
+
+async def auth_headers(client: httpx.AsyncClient, username: str, password: str) -> dict[str, str]:
+    res = await client.post("/api/auth/login", data={"username": username, "password": password})
+    res.raise_for_status()
+    return {"Authorization": f"Bearer {res.json()['access_token']}"}
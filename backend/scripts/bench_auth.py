@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+# Per-request auth cost: JWT verification with and without the decoded-token
+# cache, and principal resolution via the user lookup vs token claims
+# (AUTH_TRUST_CLAIMS). Times the dependency functions directly.
+#
+#   python -m scripts.bench_auth --iterations 20000
+
+import argparse
+import asyncio
+import json
+import time
+
+from jose import jwt
+
+from app.core import security
+from app.core.config import settings
+from app.dependencies import auth
+from app.models.enums import Role
+from scripts._bench import ensure_user, prepare_schema, summarize
+
+USERNAME = "bench_admin"
+PASSWORD = "bench_password"
+
+
+def _time_sync(fn, iterations: int) -> dict:
+    samples: list[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+async def _time_async(fn, iterations: int) -> dict:
+    samples: list[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+async def main(iterations: int) -> None:
+    await prepare_schema()
+    await ensure_user(USERNAME, PASSWORD)
+    token = security.create_access_token(subject=USERNAME, role=Role.admin.value, user_id=1)
+
+    results = {
+        "decode.jose": _time_sync(
+            lambda: jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm]), iterations,
+        ),
+        "decode.cached": _time_sync(lambda: security.decode_token(token), iterations),
+    }
+
+    # User lookup on every request (principal cache cleared) vs principal cache.
+    async def lookup():
+        auth.principal_cache.clear()
+        await auth.get_token_principal(token)
+
+    settings.auth_trust_claims = False
+    results["principal.db_lookup"] = await _time_async(lookup, max(1, iterations // 10))
+    results["principal.cached"] = await _time_async(lambda: auth.get_token_principal(token), iterations)
+    settings.auth_trust_claims = True
+    results["principal.claims"] = await _time_async(lambda: auth.get_token_principal(token), iterations)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
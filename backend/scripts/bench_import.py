@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+# Import throughput: bulk JSON import vs one POST per student.
+#
+#   python -m scripts.bench_import --rows 5000 --baseline-rows 200
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from app.core.limiter import limiter
+from app.main import app
+from scripts._bench import asgi_client, auth_headers, ensure_user, prepare_schema
+
+USERNAME = "bench_admin"
+PASSWORD = "bench_password"
+STATUSES = ["enrolled", "active", "completed"]
+
+
+def make_rows(n: int) -> list[dict]:
+    return [
+        {
+            "name": f"Import Student {i}",
+            "status": random.choice(STATUSES),
+            "progress_hours": round(random.uniform(0, 50), 1),
+            "notes": None,
+        }
+        for i in range(n)
+    ]
+
+
+async def main(rows: int, baseline_rows: int) -> None:
+    limiter.enabled = False
+    await prepare_schema()
+    await ensure_user(USERNAME, PASSWORD)
+
+    async with asgi_client(app) as client:
+        headers = await auth_headers(client, USERNAME, PASSWORD)
+
+        payload = make_rows(rows)
+        start = time.perf_counter()
+        res = await client.post("/api/students/import", json=payload, headers=headers)
+        bulk_s = time.perf_counter() - start
+        res.raise_for_status()
+
+        start = time.perf_counter()
+        for row in make_rows(baseline_rows):
+            (await client.post("/api/students/", json=row, headers=headers)).raise_for_status()
+        single_s = time.perf_counter() - start
+
+    print(json.dumps({
+        "bulk": {"rows": res.json()["inserted"], "seconds": round(bulk_s, 3), "rows_per_sec": round(rows / bulk_s, 1)},
+        "per_row": {"rows": baseline_rows, "seconds": round(single_s, 3), "rows_per_sec": round(baseline_rows / single_s, 1)},
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--baseline-rows", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.baseline_rows))
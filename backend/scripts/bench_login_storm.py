@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+# Measures p99 latency of cheap endpoints while a burst of logins runs bcrypt.
+# With hashing on the event loop the probe p99 tracks bcrypt cost; with the
+# hashing pool it should stay close to the idle baseline.
+#
+#   python -m scripts.bench_login_storm --logins 200 --concurrency 50
+
+import argparse
+import asyncio
+import json
+
+from app.core.limiter import limiter
+from app.main import app
+from scripts._bench import Timer, asgi_client, auth_headers, ensure_user, prepare_schema, summarize
+
+USERNAME = "bench_admin"
+PASSWORD = "bench_password"
+
+
+async def probe(client, headers, timer: Timer, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        async with timer.measure():
+            await client.get("/api/students/?limit=20", headers=headers)
+        await asyncio.sleep(0.005)
+
+
+async def storm(client, logins: int, concurrency: int) -> dict[int, int]:
+    codes: dict[int, int] = {}
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with sem:
+            res = await client.post("/api/auth/login", data={"username": USERNAME, "password": "wrong_password"})
+            codes[res.status_code] = codes.get(res.status_code, 0) + 1
+
+    await asyncio.gather(*(one() for _ in range(logins)))
+    return codes
+
+
+async def main(logins: int, concurrency: int, baseline_s: float) -> None:
+    limiter.enabled = False
+    await prepare_schema()
+    await ensure_user(USERNAME, PASSWORD)
+
+    async with asgi_client(app) as client:
+        headers = await auth_headers(client, USERNAME, PASSWORD)
+
+        idle, stop = Timer(), asyncio.Event()
+        task = asyncio.create_task(probe(client, headers, idle, stop))
+        await asyncio.sleep(baseline_s)
+        stop.set()
+        await task
+
+        loaded, stop = Timer(), asyncio.Event()
+        task = asyncio.create_task(probe(client, headers, loaded, stop))
+        codes = await storm(client, logins, concurrency)
+        stop.set()
+        await task
+
+    print(json.dumps({
+        "logins": logins,
+        "concurrency": concurrency,
+        "login_status_codes": codes,
+        "probe_idle": summarize(idle.samples),
+        "probe_during_storm": summarize(loaded.samples),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--baseline-seconds", type=float, default=2.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.concurrency, args.baseline_seconds))
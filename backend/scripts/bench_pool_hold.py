@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+# Throughput of authenticated reads with a deliberately small pool, to show
+# the effect of connection hold time. Needs a pooled engine, i.e. Postgres and
+# ENV != dev, e.g.:
+#
+#   ENV=prod DB_POOL_SIZE=4 DB_MAX_OVERFLOW=0 python -m scripts.bench_pool_hold --requests 2000 --concurrency 64
+
+import argparse
+import asyncio
+import json
+import time
+
+from app.core.limiter import limiter
+from app.db.database import engine, pool_status
+from app.main import app
+from scripts._bench import Timer, asgi_client, auth_headers, ensure_user, prepare_schema, summarize
+
+USERNAME = "bench_admin"
+PASSWORD = "bench_password"
+PATHS = ["/api/students/?limit=50", "/api/dashboard-stats", "/api/auth/me"]
+
+
+async def main(requests: int, concurrency: int) -> None:
+    limiter.enabled = False
+    await prepare_schema()
+    await ensure_user(USERNAME, PASSWORD)
+
+    async with asgi_client(app) as client:
+        headers = await auth_headers(client, USERNAME, PASSWORD)
+        timer = Timer()
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one(i: int) -> None:
+            async with sem, timer.measure():
+                (await client.get(PATHS[i % len(PATHS)], headers=headers)).raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        "requests": requests,
+        "concurrency": concurrency,
+        "requests_per_sec": round(requests / elapsed, 1),
+        "latency": summarize(timer.samples),
+        "pool": pool_status(engine),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
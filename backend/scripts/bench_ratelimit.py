@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+# Per-request cost of the rate limiter: the raw in-memory backend, the full
+# FastAPI dependency (key extraction + backend) and, when DATABASE_URL points
+# at a migrated Postgres, the shared backend.
+#
+#   python -m scripts.bench_ratelimit --hits 200000 --keys 5000
+
+import argparse
+import asyncio
+import json
+import time
+
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.limiter import MemoryBackend, PostgresBackend, Rate, RateLimiter
+
+
+def _request(ip: str) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/api/students/",
+        "headers": [(b"x-forwarded-for", ip.encode())],
+        "client": ("10.0.0.1", 12345),
+    })
+
+
+def per_hit_ns(elapsed: float, hits: int) -> float:
+    return round(elapsed / hits * 1e9, 1)
+
+
+async def main(hits: int, keys: int, pg_hits: int) -> None:
+    rate = Rate.parse("1000000/minute")
+    report: dict = {"hits": hits, "keys": keys}
+
+    backend = MemoryBackend()
+    start = time.perf_counter()
+    for i in range(hits):
+        backend.hit_sync(f"bench|{i % keys}", rate)
+    report["memory_backend_ns_per_hit"] = per_hit_ns(time.perf_counter() - start, hits)
+
+    dep = RateLimiter(MemoryBackend()).limit("1000000/minute", scope="bench")
+    requests = [_request(f"203.0.113.{i % 250}") for i in range(keys)]
+    start = time.perf_counter()
+    for i in range(hits):
+        await dep(requests[i % keys])
+    report["dependency_ns_per_hit"] = per_hit_ns(time.perf_counter() - start, hits)
+
+    if pg_hits and settings.database_url.startswith(("postgres", "postgresql")):
+        pg = PostgresBackend()
+        start = time.perf_counter()
+        for i in range(pg_hits):
+            await pg.hit(f"bench|{i % keys}", rate)
+        report["postgres_backend_us_per_hit"] = round((time.perf_counter() - start) / pg_hits * 1e6, 1)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hits", type=int, default=200_000)
+    parser.add_argument("--keys", type=int, default=5000)
+    parser.add_argument("--pg-hits", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.hits, args.keys, args.pg_hits))
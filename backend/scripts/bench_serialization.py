@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+# Per-page cost of the student list response: ORM -> StudentOut -> response
+# model validation -> JSON (previous path) vs column rows -> orjson (fast path).
+# Seeds --rows students if the table is smaller, then times fetch+encode for
+# one page and reports peak allocations via tracemalloc.
+#
+#   python -m scripts.bench_serialization --page 200 --iterations 200
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import func, select
+
+from app.crud import student as crud
+from app.db.database import AsyncSessionLocal
+from app.models.student import Student
+from app.schemas.student import StudentOut
+from scripts._bench import prepare_schema, summarize
+
+_adapter = TypeAdapter(list[StudentOut])
+
+
+async def orm_path(db, page: int) -> bytes:
+    items = await crud.list_students(db, limit=page)
+    out = [StudentOut(**s.__dict__) for s in items]
+    validated = _adapter.validate_python(out)
+    return orjson.dumps(jsonable_encoder(validated))
+
+
+async def rows_path(db, page: int) -> bytes:
+    rows = await crud.list_student_rows(db, limit=page)
+    return orjson.dumps([r._asdict() for r in rows])
+
+
+async def measure(fn, page: int, iterations: int) -> dict:
+    samples: list[float] = []
+    async with AsyncSessionLocal() as db:
+        await fn(db, page)  # warm up
+        for _ in range(iterations):
+            start = time.perf_counter()
+            await fn(db, page)
+            samples.append(time.perf_counter() - start)
+            db.expunge_all()
+        tracemalloc.start()
+        await fn(db, page)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {"latency": summarize(samples), "peak_alloc_kib": round(peak / 1024, 1)}
+
+
+async def main(page: int, iterations: int, rows: int) -> None:
+    await prepare_schema()
+    async with AsyncSessionLocal() as db:
+        have = (await db.execute(select(func.count(Student.id)))).scalar_one()
+        if have < rows:
+            await crud.bulk_create_students(db, [
+                {"name": f"Bench Student {i}", "status": "active", "progress_hours": i % 40, "notes": "note " * 8}
+                for i in range(rows - have)
+            ])
+
+    print(json.dumps({
+        "page": page,
+        "orm_model_validate": await measure(orm_path, page, iterations),
+        "rows_orjson": await measure(rows_path, page, iterations),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--page", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.page, args.iterations, args.rows))
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+# Burst of identical hot reads, as when a class starts and every instructor
+# opens the same dashboard and student page: --clients concurrent callers,
+# each on its own read session, call dashboard_stats (stats cache cleared)
+# and get_student_row. Reports DB statements and latency with single-flight
+# coalescing off and on.
+#
+#   python -m scripts.bench_singleflight --clients 200
+
+import argparse
+import asyncio
+import json
+import time
+
+from sqlalchemy import event, select
+
+from app.core.config import settings
+from app.crud import student as crud
+from app.db.database import AsyncSessionLocal, ReplicaReadSessionLocal, engine, read_engine
+from app.models.student import Student
+from scripts._bench import prepare_schema, summarize
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args) -> None:
+        self.count += 1
+
+
+async def burst(clients: int, student_id: int) -> dict:
+    counter = QueryCounter()
+    engines = {id(e.sync_engine): e.sync_engine for e in (engine, read_engine)}.values()
+    for e in engines:
+        event.listen(e, "before_cursor_execute", counter)
+    samples: list[float] = []
+
+    async def client() -> None:
+        start = time.perf_counter()
+        async with ReplicaReadSessionLocal() as db:
+            # As the routes do: key the reads on the students version.
+            version = await crud.students_version(db)
+            await crud.dashboard_stats(db, version=version)
+            await crud.get_student_row(db, student_id, version=version or 0)
+        samples.append(time.perf_counter() - start)
+
+    crud._stats_cache.clear()
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(client() for _ in range(clients)))
+    finally:
+        for e in engines:
+            event.remove(e, "before_cursor_execute", counter)
+    return {
+        "queries": counter.count,
+        "wall_ms": round((time.perf_counter() - start) * 1000, 3),
+        "latency": summarize(samples),
+    }
+
+
+async def main(clients: int) -> None:
+    await prepare_schema()
+    async with AsyncSessionLocal() as db:
+        student_id = (await db.execute(select(Student.id).limit(1))).scalar_one_or_none()
+        if student_id is None:
+            student_id = (await crud.bulk_create_students(db, [{"name": "Burst Student"}]))[0]
+
+    settings.singleflight_enabled = False
+    off = await burst(clients, student_id)
+    settings.singleflight_enabled = True
+    on = await burst(clients, student_id)
+    await engine.dispose()
+
+    print(json.dumps({
+        "clients": clients,
+        "singleflight_off": off,
+        "singleflight_on": on,
+        "coalesced_calls": crud.dashboard_stats.followers + crud._shared_student_row.followers,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.clients))
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+# Reproducible benchmark suite: crud/serialization microbenchmarks plus an
+# in-process HTTP scenario (login, list, get, update, dashboard), written as a
+# JSON report that can be diffed across commits. Seed first with
+# scripts.seed_data, then e.g.:
+#
+#   python -m scripts.bench_suite --out bench-$(git rev-parse --short HEAD).json
+#   python -m scripts.bench_suite --baseline bench-abc1234.json
+#
+# With --baseline, p50/p99 deltas against the earlier report are printed.
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import orjson
+from sqlalchemy import func, select
+
+from app.core.limiter import limiter
+from app.crud import student as crud
+from app.db.database import AsyncSessionLocal, engine
+from app.main import app
+from app.models.student import Student
+from scripts._bench import Timer, asgi_client, auth_headers, ensure_user, prepare_schema, summarize
+
+USERNAME = "bench_admin"
+PASSWORD = "bench_password"
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def _time(fn, iterations: int) -> dict:
+    await fn()  # warm up
+    samples: list[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+async def micro(iterations: int, ids: list[int]) -> dict:
+    results: dict[str, dict] = {}
+    rng = random.Random(0)
+    async with AsyncSessionLocal() as db:
+        async def list_orm():
+            await crud.list_students(db, limit=200)
+            db.expunge_all()
+
+        async def list_rows():
+            await crud.list_student_rows(db, limit=200)
+
+        async def list_rows_json():
+            rows = await crud.list_student_rows(db, limit=200)
+            orjson.dumps([r._asdict() for r in rows])
+
+        async def get_row():
+            await crud.get_student_row(db, rng.choice(ids))
+
+        async def stats_uncached():
+            crud._stats_cache.clear()
+            await crud.dashboard_stats(db)
+
+        async def stats_cached():
+            await crud.dashboard_stats(db)
+
+        for name, fn in [
+            ("crud.list_students", list_orm),
+            ("crud.list_student_rows", list_rows),
+            ("serialize.list_rows_orjson", list_rows_json),
+            ("crud.get_student_row", get_row),
+            ("crud.dashboard_stats.uncached", stats_uncached),
+            ("crud.dashboard_stats.cached", stats_cached),
+        ]:
+            results[name] = await _time(fn, iterations)
+    return results
+
+
+async def http(requests: int, concurrency: int, logins: int, ids: list[int]) -> dict:
+    rng = random.Random(1)
+    scenarios: dict[str, Timer] = {k: Timer() for k in ("login", "list", "get", "update", "dashboard")}
+    async with asgi_client(app) as client:
+        headers = await auth_headers(client, USERNAME, PASSWORD)
+
+        async def login(_: int) -> None:
+            async with scenarios["login"].measure():
+                res = await client.post("/api/auth/login", data={"username": USERNAME, "password": PASSWORD})
+            res.raise_for_status()
+
+        async def mixed(i: int) -> None:
+            kind = ("list", "get", "get", "dashboard", "update")[i % 5]
+            sid = rng.choice(ids)
+            async with scenarios[kind].measure():
+                if kind == "list":
+                    res = await client.get("/api/students/?limit=50", headers=headers)
+                elif kind == "get":
+                    res = await client.get(f"/api/students/{sid}", headers=headers)
+                elif kind == "dashboard":
+                    res = await client.get("/api/dashboard-stats", headers=headers)
+                else:
+                    res = await client.put(
+                        f"/api/students/{sid}", json={"notes": f"bench {i}"}, headers=headers,
+                    )
+            res.raise_for_status()
+
+        sem = asyncio.Semaphore(concurrency)
+
+        async def bounded(fn, i: int) -> None:
+            async with sem:
+                await fn(i)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(bounded(login, i) for i in range(logins)))
+        await asyncio.gather(*(bounded(mixed, i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "requests": requests + logins,
+        "concurrency": concurrency,
+        "requests_per_sec": round((requests + logins) / elapsed, 1),
+        "scenarios": {k: summarize(t.samples) for k, t in scenarios.items()},
+    }
+
+
+def _flatten(report: dict) -> dict[str, dict]:
+    flat = dict(report["micro"])
+    flat.update({f"http.{k}": v for k, v in report["http"]["scenarios"].items()})
+    return flat
+
+
+def compare(report: dict, baseline: dict) -> None:
+    old = _flatten(baseline)
+    print(f"{'benchmark':36} {'p50 ms':>10} {'Δp50':>8} {'p99 ms':>10} {'Δp99':>8}")
+    for name, cur in _flatten(report).items():
+        prev = old.get(name)
+        deltas = []
+        for key in ("p50_ms", "p99_ms"):
+            if prev and prev.get(key):
+                deltas.append(f"{(cur[key] - prev[key]) / prev[key] * 100:+.1f}%")
+            else:
+                deltas.append("n/a")
+        print(f"{name:36} {cur['p50_ms']:>10.3f} {deltas[0]:>8} {cur['p99_ms']:>10.3f} {deltas[1]:>8}")
+
+
+async def main(args: argparse.Namespace) -> None:
+    limiter.enabled = False
+    await prepare_schema()
+    await ensure_user(USERNAME, PASSWORD)
+    async with AsyncSessionLocal() as db:
+        total = (await db.execute(select(func.count(Student.id)))).scalar_one()
+        if total == 0:
+            raise SystemExit("No students; run `python -m scripts.seed_data` first.")
+        ids = list((await db.execute(select(Student.id).limit(args.sample_ids))).scalars())
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "dialect": engine.dialect.name,
+            "students": total,
+        },
+        "micro": await micro(args.iterations, ids),
+        "http": await http(args.requests, args.concurrency, args.logins, ids),
+    }
+    await engine.dispose()
+
+    encoded = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as fh:
+            fh.write(encoded + "\n")
+    else:
+        print(encoded)
+    if args.baseline:
+        with open(args.baseline) as fh:
+            compare(report, json.load(fh))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--logins", type=int, default=20)
+    parser.add_argument("--sample-ids", type=int, default=5000)
+    parser.add_argument("--out")
+    parser.add_argument("--baseline")
+    asyncio.run(main(parser.parse_args()))
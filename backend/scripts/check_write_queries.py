@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+# Guards the single-round-trip write paths: runs each crud write once and
+# fails if it issues more statements than budgeted (the write itself, plus the
+# version bump and, on Postgres, the NOTIFY for student writes). Also times
+# each write. Exits non-zero on a regression, so it can run in CI:
+#
+#   python -m scripts.check_write_queries
+
+import asyncio
+import json
+import sys
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.crud import student as students
+from app.crud import user as users
+from app.db.database import AsyncSessionLocal, engine
+from app.models.enums import Role, StudentStatus
+from app.schemas.student import StudentCreate, StudentUpdate
+from scripts._bench import prepare_schema
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args) -> None:
+        self.count += 1
+
+
+@contextmanager
+def counting():
+    counter = QueryCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", counter)
+
+
+async def main() -> int:
+    await prepare_schema()
+    notify = 1 if engine.dialect.name == "postgresql" else 0
+    results: dict[str, dict] = {}
+    failed = False
+
+    async def check(name: str, budget: int, fn):
+        nonlocal failed
+        async with AsyncSessionLocal() as db:
+            with counting() as counter:
+                start = time.perf_counter()
+                value = await fn(db)
+                elapsed = time.perf_counter() - start
+        ok = counter.count <= budget
+        failed |= not ok
+        results[name] = {"queries": counter.count, "budget": budget, "ok": ok, "ms": round(elapsed * 1000, 3)}
+        return value
+
+    row = await check("student.create", 2 + notify, lambda db: students.create_student(
+        db, StudentCreate(name="Query Budget", status=StudentStatus.enrolled, progress_hours=0, notes=None),
+    ))
+    await check("student.update", 2 + notify, lambda db: students.update_student(
+        db, row.id, StudentUpdate(progress_hours=2.5),
+    ))
+    await check("student.update.missing", 1, lambda db: students.update_student(
+        db, -1, StudentUpdate(progress_hours=2.5),
+    ))
+    await check("student.delete", 2 + notify, lambda db: students.delete_student(db, row.id))
+
+    # Hashing happens before the INSERT; only statements are counted.
+    user = await check("user.create", 1, lambda db: users.create_user(
+        db, username=f"budget_{time.time_ns()}", password="budget_password", role=Role.instructor,
+    ))
+    await check("user.update_role", 1, lambda db: users.update_user_role(db, user.id, Role.admin))
+    await check("user.delete", 1, lambda db: users.delete_user(db, user.id))
+
+    await engine.dispose()
+    print(json.dumps(results, indent=2))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
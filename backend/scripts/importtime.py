@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+# Import cost of the worker entry point. Runs `python -X importtime -c "import
+# app.main"` in a fresh interpreter and prints the total plus the top-level
+# packages that cost the most. Each module's self time (excluding its own
+# imports) is charged to its top-level package, so e.g. sqlalchemy pulled in
+# by app.db shows up as sqlalchemy, not app:
+#
+#   python -m scripts.importtime --top 15
+
+import argparse
+import subprocess
+import sys
+from collections import defaultdict
+
+
+def main(module: str, top: int) -> None:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        sys.exit(proc.stderr.strip().splitlines()[-1])
+
+    by_package: dict[str, int] = defaultdict(int)
+    total = 0
+    for line in proc.stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        by_package[name.strip().split(".")[0]] += int(self_us)
+        total += int(self_us)
+
+    print(f"import {module}: {total / 1000:.1f} ms")
+    for name, us in sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)[:top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    main(args.module, args.top)
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+# Maintenance for the monthly drive_sessions partitions (migration 0006). Run
+# daily from cron:
+#
+#   python -m scripts.manage_partitions --ahead 3 --retain-months 24 [--drop] [--dry-run]
+#
+# Creates partitions for the current month and --ahead months after it, so
+# new rows never land in the default partition. Rows that did land there
+# (sessions backdated past the months migration 0006 created) are first moved
+# to partitions for their months: Postgres cannot create a partition for a
+# range the default already holds rows for, so the default is detached, the
+# month's partition created and filled, and the default re-attached, in one
+# transaction per month. Run it once after backfilling old sessions.
+#
+# Detaches months older than --retain-months; with --drop, also drops them.
+# Without --drop the detached table is kept and can be archived and dropped
+# by hand. DETACH ... CONCURRENTLY is used when the table has no default
+# partition; otherwise a plain DETACH, which only changes the catalog but
+# takes a brief exclusive lock, guarded by lock_timeout.
+
+import argparse
+import asyncio
+import re
+from datetime import date
+
+from sqlalchemy import text
+
+from app.db.database import autocommit_engine, engine
+
+PARENT = "drive_sessions"
+MONTHLY = re.compile(rf"^{PARENT}_y(\d{{4}})m(\d{{2}})$")
+
+
+def month_add(d: date, months: int) -> date:
+    n = d.year * 12 + d.month - 1 + months
+    return date(n // 12, n % 12 + 1, 1)
+
+
+def partition_name(d: date) -> str:
+    return f"{PARENT}_y{d:%Y}m{d:%m}"
+
+
+async def partitions(conn) -> tuple[set[str], str | None]:
+    rows = (await conn.execute(text(
+        """
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) = 'DEFAULT'
+        FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = CAST(:parent AS regclass)
+        """
+    ), {"parent": PARENT})).all()
+    return {name for name, _ in rows}, next((name for name, is_default in rows if is_default), None)
+
+
+async def main(ahead: int, retain_months: int | None, drop: bool, dry_run: bool) -> None:
+    async with autocommit_engine.connect() as conn:
+        existing, default = await partitions(conn)
+        # Names created by this run; with --dry-run they are not in the catalog.
+        planned: set[str] = set()
+
+        async def run(sql: str) -> None:
+            print(("[dry-run] " if dry_run else "") + sql)
+            if not dry_run:
+                await conn.execute(text(sql))
+
+        # Split the default first: creating a partition for a month the
+        # default holds rows for fails.
+        if default is not None:
+            months = (await conn.execute(text(
+                f"SELECT DISTINCT CAST(date_trunc('month', started_at) AS date) FROM {default} ORDER BY 1"
+            ))).scalars().all()
+            for lo in months:
+                await split_default(default, lo, dry_run)
+                planned.add(partition_name(lo))
+            existing = (await partitions(conn))[0] | planned
+
+        this_month = date.today().replace(day=1)
+        for i in range(ahead + 1):
+            lo, hi = month_add(this_month, i), month_add(this_month, i + 1)
+            if partition_name(lo) not in existing:
+                await run(
+                    f"CREATE TABLE {partition_name(lo)} PARTITION OF {PARENT} "
+                    f"FOR VALUES FROM ('{lo.isoformat()}') TO ('{hi.isoformat()}')"
+                )
+                planned.add(partition_name(lo))
+
+        if retain_months is not None:
+            existing = (await partitions(conn))[0] | planned
+            cutoff = month_add(this_month, -retain_months)
+            for name in sorted(existing):
+                m = MONTHLY.match(name)
+                if not m or date(int(m[1]), int(m[2]), 1) >= cutoff:
+                    continue
+                if default is None:
+                    await run(f"ALTER TABLE {PARENT} DETACH PARTITION {name} CONCURRENTLY")
+                else:
+                    await run("SET lock_timeout = '5s'")
+                    await run(f"ALTER TABLE {PARENT} DETACH PARTITION {name}")
+                if drop:
+                    await run(f"DROP TABLE {name}")
+    await engine.dispose()
+
+
+async def split_default(default: str, lo: date, dry_run: bool) -> None:
+    hi = month_add(lo, 1)
+    name = partition_name(lo)
+    bounds = f"started_at >= '{lo.isoformat()}' AND started_at < '{hi.isoformat()}'"
+    statements = [
+        "SET LOCAL lock_timeout = '5s'",
+        f"ALTER TABLE {PARENT} DETACH PARTITION {default}",
+        f"CREATE TABLE {name} PARTITION OF {PARENT} "
+        f"FOR VALUES FROM ('{lo.isoformat()}') TO ('{hi.isoformat()}')",
+        f"INSERT INTO {name} SELECT * FROM {default} WHERE {bounds}",
+        f"DELETE FROM {default} WHERE {bounds}",
+        f"ALTER TABLE {PARENT} ATTACH PARTITION {default} DEFAULT",
+    ]
+    async with engine.begin() as conn:
+        for sql in statements:
+            print(("[dry-run] " if dry_run else "") + sql)
+            if not dry_run:
+                await conn.execute(text(sql))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ahead", type=int, default=3)
+    parser.add_argument("--retain-months", type=int)
+    parser.add_argument("--drop", action="store_true")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.ahead, args.retain_months, args.drop, args.dry_run))
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+# Writes .br and .gz siblings for the built frontend so PrecompressedStaticFiles
+# can serve them without compressing per request. Run after `npm run build`:
+#
+#   python -m scripts.precompress_static ../frontend/dist
+#
+# Variants are only kept when smaller than the original. Output is
+# deterministic (gzip mtime 0), so unchanged inputs give identical files.
+
+import argparse
+import gzip
+import os
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+EXTENSIONS = (".js", ".mjs", ".css", ".html", ".svg", ".json", ".map", ".txt", ".xml", ".wasm", ".ico")
+
+
+def precompress(path: str, min_size: int) -> tuple[int, int]:
+    with open(path, "rb") as fh:
+        data = fh.read()
+    if len(data) < min_size:
+        return 0, 0
+    written = saved = 0
+    variants = [(".gz", lambda: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append((".br", lambda: brotli.compress(data, quality=11)))
+    for suffix, compress in variants:
+        out = compress()
+        if len(out) >= len(data):
+            continue
+        with open(path + suffix, "wb") as fh:
+            fh.write(out)
+        written += 1
+        saved += len(data) - len(out)
+    return written, saved
+
+
+def main(directory: str, min_size: int) -> None:
+    if brotli is None:
+        print("brotli not installed; writing .gz only")
+    files = written = saved = 0
+    for base, _, names in os.walk(directory):
+        for name in names:
+            if name.endswith(EXTENSIONS):
+                n, s = precompress(os.path.join(base, name), min_size)
+                files += 1
+                written += n
+                saved += s
+    print(f"{files} files, {written} variants written, {saved / 1024:.1f} KiB saved per full download")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("directory")
+    parser.add_argument("--min-size", type=int, default=256)
+    args = parser.parse_args()
+    main(args.directory, args.min_size)
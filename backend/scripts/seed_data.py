@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+# Synthetic data generator for load tests and benchmarks. Bulk-loads users and
+# students with realistic status/progress distributions:
+#
+#   python -m scripts.seed_data --users 50 --students 1000000 --seed 42
+#
+# Uses COPY on Postgres (asyncpg copy_records_to_table) and batched multi-row
+# INSERTs elsewhere. All users share one password (--password) so only a
+# single bcrypt hash is computed. Creates missing tables first (as the bench
+# harnesses do) and skips users that already exist, so it can be re-run to
+# add more students. Intended for throwaway databases.
+
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import insert, select
+
+from app.core.security import hash_password
+from app.crud.student import STUDENTS_VERSION
+from app.crud.version import bump_version
+from app.db.database import AsyncSessionLocal, engine
+from app.models.enums import Role, StudentStatus
+from app.models.student import Student
+from app.models.user import User
+from scripts._bench import prepare_schema
+
+FIRST = ["Ava", "Liam", "Mia", "Noah", "Zoe", "Ethan", "Isla", "Lucas", "Aria", "Mateo", "Chloe", "Omar",
+         "Priya", "Kenji", "Sofia", "Diego", "Amara", "Felix", "Nora", "Yusuf", "Elena", "Jonah", "Leila", "Tariq"]
+LAST = ["Smith", "Garcia", "Nguyen", "Patel", "Kim", "Johnson", "Silva", "Okafor", "Muller", "Rossi",
+        "Haddad", "Kowalski", "Tanaka", "Brown", "Lopez", "Ivanova", "Mensah", "Cohen", "Singh", "Dubois"]
+NOTES = ["Prefers morning sessions", "Needs highway practice", "Parallel parking is weak",
+         "Nervous on left turns", "Ready for road test", "Missed last lesson"]
+
+# Roughly what a school's roster looks like mid-season.
+STATUS_WEIGHTS = [(StudentStatus.enrolled, 0.30), (StudentStatus.active, 0.50), (StudentStatus.completed, 0.20)]
+
+
+def make_student(rng: random.Random) -> tuple[str, StudentStatus, float, str | None]:
+    status = rng.choices([s for s, _ in STATUS_WEIGHTS], weights=[w for _, w in STATUS_WEIGHTS])[0]
+    if status is StudentStatus.enrolled:
+        hours = 0.0 if rng.random() < 0.7 else round(rng.uniform(0, 2), 1)
+    elif status is StudentStatus.active:
+        hours = round(rng.triangular(1, 40, 12), 1)
+    else:
+        hours = round(max(30.0, rng.gauss(45, 6)), 1)
+    notes = rng.choice(NOTES) if rng.random() < 0.2 else None
+    name = f"{rng.choice(FIRST)} {rng.choice(LAST)}"
+    return name, status, hours, notes
+
+
+async def seed_users(count: int, password: str) -> int:
+    hashed = hash_password(password)
+    rows = [
+        {"username": f"bench_{'admin' if i == 0 else 'instructor'}_{i:05d}", "hashed_password": hashed,
+         "role": Role.admin if i == 0 else Role.instructor}
+        for i in range(count)
+    ]
+    async with AsyncSessionLocal() as db:
+        taken = set((await db.execute(
+            select(User.username).where(User.username.in_([r["username"] for r in rows]))
+        )).scalars())
+        rows = [r for r in rows if r["username"] not in taken]
+        if rows:
+            await db.execute(insert(User.__table__), rows)
+        await db.commit()
+    return len(rows)
+
+
+async def seed_students(count: int, batch: int, rng: random.Random) -> int:
+    columns = ["name", "status", "progress_hours", "notes"]
+    done = 0
+    async with engine.connect() as conn:
+        copy = conn.dialect.name == "postgresql"
+        while done < count:
+            n = min(batch, count - done)
+            records = [make_student(rng) for _ in range(n)]
+            if copy:
+                raw = await conn.get_raw_connection()
+                await raw.driver_connection.copy_records_to_table(
+                    "students", records=[(a, s.value, h, t) for a, s, h, t in records], columns=columns,
+                )
+            else:
+                await conn.execute(insert(Student.__table__), [dict(zip(columns, r)) for r in records])
+            done += n
+            print(f"  students: {done}/{count}", end="\r", flush=True)
+        await conn.commit()
+    async with AsyncSessionLocal() as db:
+        await bump_version(db, STUDENTS_VERSION)
+        await db.commit()
+    print()
+    return done
+
+
+async def main(users: int, students: int, batch: int, password: str, seed: int) -> None:
+    rng = random.Random(seed)
+    await prepare_schema()
+    start = time.perf_counter()
+    n_users = await seed_users(users, password)
+    n_students = await seed_students(students, batch, rng)
+    elapsed = time.perf_counter() - start
+    print(f"Seeded {n_users} users and {n_students} students in {elapsed:.1f}s "
+          f"({n_students / elapsed:.0f} students/s).")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=10_000)
+    parser.add_argument("--password", default="bench_password")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.students, args.batch, args.password, args.seed))